@@ -1,4 +1,21 @@
-import pkgutil
-from pathlib import Path
-
-days = [d.name for d in pkgutil.iter_modules([str(p) for p in Path(__file__).parent.iterdir()])]
+# Kept by hand rather than discovered so that importing the package touches no files. Add new days here.
+days = [
+    "day01",
+    "day02",
+    "day03",
+    "day04",
+    "day05",
+    "day06",
+    "day07",
+    "day08",
+    "day09",
+    "day10",
+    "day11",
+    "day13",
+    "day14",
+    "day16",
+    "day17",
+    "day18",
+    "day19",
+    "day20",
+]
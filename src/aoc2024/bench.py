@@ -0,0 +1,173 @@
+import contextlib
+import importlib
+import io
+import json
+import math
+import statistics
+import time
+import traceback
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from aoc2024.memory import listening_for_parse
+from aoc2024.paths import DATA_DIRECTORY
+
+# Alongside the inputs themselves. Maps a day to the lines it should print.
+ANSWERS_PATH = DATA_DIRECTORY / "answers.json"
+
+
+@dataclass
+class BenchResult:
+    """
+    Timings of one day over every measured run, in seconds. `correct` is None when there is no known answer.
+
+    `parse_median` and `solve_median` split the median run at the point the day's `parse_phase` parser returned, both
+    are None for a day that doesn't mark one. A day that raised has `error` set and NaN timings.
+    """
+
+    day: str
+    runs: int
+    min: float
+    median: float
+    p95: float
+    stdev: float
+    correct: bool | None
+    baseline_median: float | None = None
+    regressed: bool = False
+    parse_median: float | None = None
+    solve_median: float | None = None
+    error: str | None = None
+
+
+class _ParseTimer:
+    def __init__(self) -> None:
+        self.parsed_at: float | None = None
+
+    def end_parse(self) -> None:
+        if self.parsed_at is None:
+            self.parsed_at = time.perf_counter()
+
+
+def bench_days(
+    days: Iterable[str],
+    runs: int = 5,
+    warmup: int = 1,
+    answers: dict[str, list[str]] | None = None,
+) -> list[BenchResult]:
+    """
+    Run each day's `main` `warmup` times untimed and then `runs` times timed, with stdout captured and stderr (progress
+    bars) thrown away. The output of every run, warmup included, is checked against `answers` so a change that makes a
+    day faster but wrong is caught in the same run. A day that raises is recorded as failed and the rest still run.
+
+    Whatever caches are switched on stay on, so leave `AOC_NO_CACHE` set to time parsing and solving from scratch.
+    """
+    if runs < 1 or warmup < 0:
+        raise ValueError("need at least one timed run and a non-negative warmup")
+    results = []
+    for day in days:
+        expected = answers.get(day) if answers is not None else None
+        try:
+            results.append(_bench_day(day, runs, warmup, expected))
+        except Exception as e:
+            traceback.print_exc()
+            results.append(
+                BenchResult(day, 0, math.nan, math.nan, math.nan, math.nan, False, error=f"{type(e).__name__}: {e}")
+            )
+    return results
+
+
+def _bench_day(day: str, runs: int, warmup: int, expected: list[str] | None) -> BenchResult:
+    day_main = importlib.import_module(f"aoc2024.{day}.{day}").main
+    correct: bool | None = None if expected is None else True
+    timings = []
+    parse_timings: list[float | None] = []
+    for run in range(warmup + runs):
+        output = io.StringIO()
+        parse_timer = _ParseTimer()
+        with (
+            contextlib.redirect_stdout(output),
+            contextlib.redirect_stderr(io.StringIO()),
+            listening_for_parse(parse_timer),
+        ):
+            start = time.perf_counter()
+            day_main()
+            elapsed = time.perf_counter() - start
+        if expected is not None and output.getvalue().splitlines() != expected:
+            correct = False
+        if run >= warmup:
+            timings.append(elapsed)
+            parse_timings.append(None if parse_timer.parsed_at is None else parse_timer.parsed_at - start)
+    # The phases of the median run, so parse and solve add up to the median
+    median_run = sorted(range(runs), key=timings.__getitem__)[(runs - 1) // 2]
+    parse_median = parse_timings[median_run]
+    return BenchResult(
+        day,
+        runs,
+        min(timings),
+        statistics.median(timings),
+        _percentile(timings, 95),
+        statistics.stdev(timings) if runs > 1 else 0.0,
+        correct,
+        parse_median=parse_median,
+        solve_median=None if parse_median is None else timings[median_run] - parse_median,
+    )
+
+
+def compare_to_baseline(results: list[BenchResult], baseline: list[BenchResult], threshold: float) -> None:
+    """
+    Flag every result whose median is more than `threshold` (a fraction, 0.1 for 10%) slower than the baseline median
+    for the same day. Days missing from the baseline are left unflagged.
+    """
+    baseline_medians = {result.day: result.median for result in baseline}
+    for result in results:
+        if (baseline_median := baseline_medians.get(result.day)) is not None:
+            result.baseline_median = baseline_median
+            result.regressed = result.median > baseline_median * (1 + threshold)
+
+
+def format_results(results: list[BenchResult]) -> str:
+    lines = [
+        f"{'day':<8}{'min (s)':>10}{'median (s)':>12}{'parse (s)':>11}{'solve (s)':>11}{'p95 (s)':>10}{'stdev (s)':>11}"
+        f"{'baseline':>10}  answer"
+    ]
+    for result in results:
+        if result.error is not None:
+            lines.append(f"{result.day:<8}{'':>75}  FAILED {result.error}")
+            continue
+        baseline = "-" if result.baseline_median is None else f"{result.median / result.baseline_median - 1:+.1%}"
+        answer = {None: "unchecked", True: "ok", False: "WRONG"}[result.correct]
+        parse = "-" if result.parse_median is None else f"{result.parse_median:.4f}"
+        solve = "-" if result.solve_median is None else f"{result.solve_median:.4f}"
+        lines.append(
+            f"{result.day:<8}{result.min:>10.4f}{result.median:>12.4f}{parse:>11}{solve:>11}{result.p95:>10.4f}"
+            f"{result.stdev:>11.4f}{baseline + ('!' if result.regressed else ''):>10}  {answer}"
+        )
+    return "\n".join(lines)
+
+
+def load_results(path: Path) -> list[BenchResult]:
+    with open(path) as f:
+        return [BenchResult(**result) for result in json.load(f)]
+
+
+def save_results(results: list[BenchResult], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump([asdict(result) for result in results], f, indent=2)
+
+
+def load_answers(path: Path = ANSWERS_PATH) -> dict[str, list[str]]:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        answers: dict[str, list[str]] = json.load(f)
+    return answers
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    """
+    Nearest rank percentile, so it is always one of the measured values
+    """
+    ordered = sorted(values)
+    return ordered[max(math.ceil(percent / 100 * len(ordered)) - 1, 0)]
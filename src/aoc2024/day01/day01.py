@@ -1,14 +1,33 @@
+import bisect
+import heapq
 import itertools
-from copy import copy
+import os
+import tempfile
+from array import array
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Protocol
-
+from typing import Protocol
+
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_line_chunks, replayable
+from aoc2024.paths import CACHE_DIRECTORY
+
+# Set to a number of MiB to solve with `external_sort_totals` under that budget instead of sorting in memory
+MEMORY_BUDGET_ENVIRONMENT_VARIABLE = "AOC_DAY01_MEMORY_MIB"
+# Rough cost of one value while a run is sorted: its slot in the array, its slot in the sorted list and the int itself
+_SORT_BYTES_PER_VALUE = 48
+# Never read a run in smaller blocks than this, however many runs share the budget
+_MIN_MERGE_BLOCK = 1024
+# File descriptors left for everything else the process has open while runs are being merged
+_RESERVED_DESCRIPTORS = 16
+
+# Signed 64 bit, the columns are location IDs and can run to tens of millions of rows
+Column = array[int]
+Columns = tuple[Column, Column]
 RowOperator = Callable[[int, int], int]
-ColumnOperator = Callable[[list[int], list[int]], list[int]]
-Aggregator = Callable[[list[int]], int]
-Rows = list[tuple[int, int]]
-Columns = tuple[list[int], list[int]]
+ColumnOperator = Callable[[Column, Column], Iterable[int]]
+Aggregator = Callable[[Iterable[int]], int]
 
 
 class Day1Problem(Protocol):
@@ -18,57 +37,202 @@ class Day1Problem(Protocol):
 
 @dataclass
 class RowWiseProblem:
-    data_path: Path
+    source: InputSource
     row_operator: RowOperator
     aggregator: Aggregator
 
     def solve(self) -> int:
-        return row_wise_aggregation(read_sorted_day1_rows(self.data_path), self.row_operator, self.aggregator)
+        return row_wise_aggregation(read_sorted_day1_columns(self.source), self.row_operator, self.aggregator)
 
 
 @dataclass
 class ColumnWiseProblem:
-    data_path: Path
+    source: InputSource
     column_operator: ColumnOperator
     aggregator: Aggregator
 
     def solve(self) -> int:
-        return column_wise_aggregation(read_sorted_day1_columns(self.data_path), self.column_operator, self.aggregator)
+        return column_wise_aggregation(read_sorted_day1_columns(self.source), self.column_operator, self.aggregator)
 
 
-def read_day1_lines(data_path: Path) -> list[str]:
+@cached_parser
+def read_sorted_day1_columns(source: InputSource) -> Columns:
     """
-    Strip and split input file into lines.
+    Get a tuple of the left and right column in the input data that are sorted in ascending order. The input is split
+    a chunk of whole lines at a time and each column's values go straight into a typed array, so no per row tuples or
+    strings are built.
     """
-    with open(data_path) as f:
-        lines = list(map(lambda x: x.strip(), f.readlines()))
-    return lines
+    left_col: Column = array("q")
+    right_col: Column = array("q")
+    for chunk in iter_line_chunks(source):
+        extend_columns(chunk, left_col, right_col)
+    return array("q", sorted(left_col)), array("q", sorted(right_col))
 
 
-def read_sorted_day1_columns(data_path: Path) -> Columns:
+def extend_columns(chunk: bytes, left_col: Column, right_col: Column) -> None:
+    """
+    Append the values of a chunk of whole input lines to their columns
     """
-    Get a tuple of the left and right column in the input data that are sorted in ascending order
+    values = chunk.split()
+    if len(values) % 2:
+        raise ValueError("Every row of the day 1 input needs exactly two values")
+    left_col.extend(map(int, values[0::2]))
+    right_col.extend(map(int, values[1::2]))
+
+
+def external_sort_totals(source: InputSource, memory_budget: int) -> tuple[int, int]:
     """
-    rows = [(int((row := line.split())[0]), int(row[1])) for line in read_day1_lines(data_path)]
-    columns = rows_to_sorted_columns(rows)
-    return columns
+    Solve both parts for an input too big to sort in memory, keeping roughly within `memory_budget` bytes. The columns
+    are cut into runs small enough to sort within the budget, each written sorted to its own temporary file, then all
+    the runs are merged in one streaming pass that computes both answers.
 
+    The pass visits every value of both columns in ascending order, so the similarity score is just each value times
+    its count on either side. The distance sum pairs the i-th smallest of each column, which in value order is the
+    integral of the gap between how many left and right values have been passed so far: between two consecutive
+    values every unmatched value on the side that is ahead is still to be paired with one beyond them.
 
-def read_sorted_day1_rows(data_path: Path) -> Rows:
+    When there are more runs than can be read at once, within the budget or the open file limit, they are first merged
+    in groups into fewer, longer runs until the final pass can take them all.
     """
-    Get a list of row tuples after sorting each column individually
+    run_values = max(1, memory_budget // _SORT_BYTES_PER_VALUE // 2)
+    fan_in = _merge_fan_in(memory_budget)
+    CACHE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    # Under the project rather than the system temporary directory, which is often held in memory
+    with tempfile.TemporaryDirectory(prefix="day01-runs-", dir=CACHE_DIRECTORY) as run_directory:
+        left_runs, right_runs = _write_sorted_runs(source, Path(run_directory), run_values)
+        left_runs = _reduce_runs(left_runs, fan_in, memory_budget)
+        right_runs = _reduce_runs(right_runs, fan_in, memory_budget)
+        block = max(_MIN_MERGE_BLOCK, memory_budget // 8 // max(1, len(left_runs) + len(right_runs)))
+        left_values = heapq.merge(*(_read_run(run, block) for run in left_runs))
+        right_values = heapq.merge(*(_read_run(run, block) for run in right_runs))
+        distance = similarity = balance = 0
+        previous = None
+        for value, left_count, right_count in _aligned_counts(_run_lengths(left_values), _run_lengths(right_values)):
+            if previous is not None:
+                distance += abs(balance) * (value - previous)
+            balance += left_count - right_count
+            similarity += value * left_count * right_count
+            previous = value
+    if balance:
+        raise ValueError("The day 1 columns have different lengths")
+    return distance, similarity
+
+
+def _write_sorted_runs(source: InputSource, run_directory: Path, run_values: int) -> tuple[list[Path], list[Path]]:
+    left_runs: list[Path] = []
+    right_runs: list[Path] = []
+    left_col: Column = array("q")
+    right_col: Column = array("q")
+    # Chunks no bigger than a run so reading never holds much more than the run being filled
+    for chunk in iter_line_chunks(source, min(1 << 20, run_values * 8)):
+        extend_columns(chunk, left_col, right_col)
+        if len(left_col) >= run_values:
+            _spill(left_col, run_directory / f"left-{len(left_runs)}.run", left_runs)
+            _spill(right_col, run_directory / f"right-{len(right_runs)}.run", right_runs)
+    if left_col or right_col:
+        _spill(left_col, run_directory / f"left-{len(left_runs)}.run", left_runs)
+        _spill(right_col, run_directory / f"right-{len(right_runs)}.run", right_runs)
+    return left_runs, right_runs
+
+
+def _spill(column: Column, run: Path, runs: list[Path]) -> None:
     """
-    columns = read_sorted_day1_columns(data_path)
-    # Again zips typing not parameterized correctly
-    rows = [(left, right) for left, right in zip(*columns)]
-    return rows
+    Write `column` sorted to the file `run`, add it to `runs` and empty the column
+    """
+    with open(run, "wb") as f:
+        array("q", sorted(column)).tofile(f)
+    runs.append(run)
+    del column[:]
 
 
-def rows_to_sorted_columns(rows: Rows) -> Columns:
+def _merge_fan_in(memory_budget: int) -> int:
     """
-    Ideally this would just tuple(zip(*rows)) but that introduces an ANY type which is unacceptable
+    How many runs of one column can be merged at once. Each run being read holds a block of at least
+    `_MIN_MERGE_BLOCK` values and an open file, and the final pass reads both columns' runs together, so each column
+    gets half of what the budget and the open file limit allow.
     """
-    return sorted([row[0] for row in rows]), sorted([row[1] for row in rows])
+    import resource
+
+    fan_in = memory_budget // 8 // _MIN_MERGE_BLOCK
+    soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit != resource.RLIM_INFINITY:
+        fan_in = min(fan_in, soft_limit - _RESERVED_DESCRIPTORS)
+    return max(2, fan_in // 2)
+
+
+def _reduce_runs(runs: list[Path], fan_in: int, memory_budget: int) -> list[Path]:
+    """
+    Merge `runs` in groups of `fan_in` into longer runs, pass after pass, until no more than `fan_in` are left. Each
+    run is deleted once it has been merged, so the disk never holds much more than one copy of the column.
+    """
+    # The group being merged and the merged run being written share the budget
+    block = max(_MIN_MERGE_BLOCK, memory_budget // 8 // (fan_in + 1))
+    merge_pass = 0
+    while len(runs) > fan_in:
+        merged_runs: list[Path] = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start : start + fan_in]
+            if len(group) == 1:
+                # Left over at the end of the pass, merging it alone would only copy it
+                merged_runs.append(group[0])
+                continue
+            merged = group[0].with_name(f"{group[0].stem.split('-')[0]}-{merge_pass}-{len(merged_runs)}.merged")
+            _merge_runs(group, merged, block)
+            merged_runs.append(merged)
+        runs = merged_runs
+        merge_pass += 1
+    return runs
+
+
+def _merge_runs(runs: list[Path], merged: Path, block: int) -> None:
+    with open(merged, "wb") as f:
+        values = heapq.merge(*(_read_run(run, block) for run in runs))
+        while merged_block := array("q", itertools.islice(values, block)):
+            merged_block.tofile(f)
+    for run in runs:
+        run.unlink()
+
+
+def _read_run(run: Path, block: int) -> Iterator[int]:
+    with open(run, "rb") as f:
+        remaining = os.fstat(f.fileno()).st_size // 8
+        while remaining:
+            values: Column = array("q")
+            values.fromfile(f, min(block, remaining))
+            remaining -= len(values)
+            yield from values
+
+
+def _run_lengths(values: Iterable[int]) -> Iterator[tuple[int, int]]:
+    for value, group in itertools.groupby(values):
+        yield value, sum(1 for _ in group)
+
+
+def _aligned_counts(
+    left_counts: Iterator[tuple[int, int]], right_counts: Iterator[tuple[int, int]]
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Every value in either of two ascending `(value, count)` streams with its count in each, ascending
+    """
+    left = next(left_counts, None)
+    right = next(right_counts, None)
+    while left is not None and right is not None:
+        if left[0] < right[0]:
+            yield left[0], left[1], 0
+            left = next(left_counts, None)
+        elif right[0] < left[0]:
+            yield right[0], 0, right[1]
+            right = next(right_counts, None)
+        else:
+            yield left[0], left[1], right[1]
+            left = next(left_counts, None)
+            right = next(right_counts, None)
+    while left is not None:
+        yield left[0], left[1], 0
+        left = next(left_counts, None)
+    while right is not None:
+        yield right[0], 0, right[1]
+        right = next(right_counts, None)
 
 
 def distance_row_operator(left_value: int, right_value: int) -> int:
@@ -78,39 +242,47 @@ def distance_row_operator(left_value: int, right_value: int) -> int:
     return abs(left_value - right_value)
 
 
-def sum_aggregator(values: list[int]) -> int:
+def sum_aggregator(values: Iterable[int]) -> int:
     """
     Sum implementation of the `Aggregator` callable type
     """
     return sum(values)
 
 
-def occurrence_counting_column_operator(left_col: list[int], right_col: list[int]) -> list[int]:
+def occurrence_counting_column_operator(left_col: Column, right_col: Column) -> Iterator[int]:
     """
-    Take unique values from `left_col` and get a list of each value multiplied by how many times it occurs in `left_col`
-    and by how many times it is in `right_col`.
+    Take unique values from `left_col` and get each value multiplied by how many times it occurs in `left_col` and by
+    how many times it is in `right_col`. Both columns must be sorted, as `read_sorted_day1_columns` returns them, so
+    each count is the width of the value's run found by binary search rather than a pass over the column.
     """
-    # Ensure lists are sorted but copy so we don't modify the passed lists
-    left_counts = get_occurrence_counts(sorted(copy(left_col)))
-    right_counts = get_occurrence_counts(sorted(copy(right_col)))
-    per_value_products = [
-        left_key * left_val * right_counts.get(left_key, 0) for left_key, left_val in left_counts.items()
-    ]
-    return per_value_products
+    search_start = 0
+    for value, left_count in unique_counts(left_col):
+        # Values come out ascending, so each search can start where the last one's run began
+        search_start = bisect.bisect_left(right_col, value, search_start)
+        right_count = bisect.bisect_right(right_col, value, search_start) - search_start
+        if right_count:
+            yield value * left_count * right_count
 
 
-def get_occurrence_counts(column: list[int]) -> dict[int, int]:
+def unique_counts(column: Column) -> Iterator[tuple[int, int]]:
     """
-    Get a mapping of each unique value in `column` to the number of times it occurs
+    Each unique value in the sorted `column` with the number of times it occurs, jumping over each run of a value with
+    a binary search for its end
     """
-    return {x: len(list(group)) for x, group in itertools.groupby(column)}
+    run_start = 0
+    while run_start < len(column):
+        value = column[run_start]
+        run_end = bisect.bisect_right(column, value, run_start)
+        yield value, run_end - run_start
+        run_start = run_end
 
 
-def row_wise_aggregation(rows: Rows, row_operation: RowOperator, aggregator: Aggregator) -> int:
+def row_wise_aggregation(columns: Columns, row_operation: RowOperator, aggregator: Aggregator) -> int:
     """
-    Apply a row wise aggregation and then column wise aggregation
+    Apply a row wise operation across the paired up columns and then aggregate the results
     """
-    return aggregator([row_operation(left_value, right_value) for left_value, right_value in rows])
+    left_col, right_col = columns
+    return aggregator(map(row_operation, left_col, right_col))
 
 
 def column_wise_aggregation(
@@ -129,11 +301,24 @@ def solve_problem(problem: Day1Problem) -> int:
     return problem.solve()
 
 
-def main() -> None:
+def main(source: InputSource | None = None, memory_budget_mib: float | None = None) -> None:
+    """
+    Solve in memory, or when given a `memory_budget_mib` (or `AOC_DAY01_MEMORY_MIB` is set) with an external sort
+    that stays within it
+    """
+    if memory_budget_mib is None and (budget := os.environ.get(MEMORY_BUDGET_ENVIRONMENT_VARIABLE)):
+        memory_budget_mib = float(budget)
+    if memory_budget_mib is not None:
+        # One pass, so even a stream is read straight through rather than buffered
+        for total in external_sort_totals(day_input(source, "01"), int(memory_budget_mib * 1024 * 1024)):
+            print(total)
+        return
+    # Each part reads the input for itself
+    source = replayable(day_input(source, "01"))
     print(
         solve_problem(
             RowWiseProblem(
-                Path("data/input01.txt"),
+                source,
                 distance_row_operator,
                 sum_aggregator,
             )
@@ -142,7 +327,7 @@ def main() -> None:
     print(
         solve_problem(
             ColumnWiseProblem(
-                Path("data/input01.txt"),
+                source,
                 occurrence_counting_column_operator,
                 sum_aggregator,
             )
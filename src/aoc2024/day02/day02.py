@@ -1,5 +1,20 @@
-from pathlib import Path
-from typing import Callable, Protocol
+import itertools
+import operator
+from array import array
+from collections.abc import Iterator, Sequence
+from typing import Protocol
+
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_line_chunks
+
+# Levels one after another for every report, with `offsets[i]:offsets[i + 1]` spanning the i-th report's levels
+type FlatReports = tuple[array[int], array[int]]
+
+MAX_LEVEL_STEP = 3
+# The Problem Dampener of part 2 can remove one level from a report
+DAMPENER_REMOVALS = 1
+# Per report verdict bytes in `ReportSet`
+_UNCHECKED, _UNSAFE, _SAFE = 0, 1, 2
 
 
 class Checkable(Protocol):
@@ -7,93 +22,160 @@ class Checkable(Protocol):
     def is_okay(self) -> bool: ...
 
 
-class Part1Report(Checkable):
+def is_safe(levels: Sequence[int], max_removals: int = 0) -> bool:
     """
-    Implementation of report protocol with the `is_okay` property. This implementation is pre Problem Dampener so
-    should probably be deprecated. Differences are pre-computed as they are used quite frequently
+    Whether `levels` steadily increases or decreases by 1 to 3 each step once at most `max_removals` are removed
     """
+    return is_safe_span(levels, 0, len(levels), max_removals)
 
-    def __init__(self, data: list[int]):
-        self.data = data
-        self._report_length = len(data)
-        self._differences = self._calculate_differences()
-
-    def _calculate_differences(self) -> list[int]:
-        return [self.data[i + 1] - self.data[i] for i in range(self._report_length - 1)]
-
-    @property
-    def _is_strict_monotonic(self) -> bool:
-        return all(map(lambda level_diff: level_diff < 0, self._differences)) | all(
-            map(lambda level_diff: level_diff > 0, self._differences)
-        )
-
-    @property
-    def _max_absolute_difference(self) -> float:
-        return max(map(abs, self._differences))
 
-    @property
-    def is_okay(self) -> bool:
-        if not self._is_strict_monotonic:
+def is_safe_span(levels: Sequence[int], start: int, end: int, max_removals: int = 0) -> bool:
+    """
+    `is_safe` for `levels[start:end]` without copying it out, in O((end - start) * (max_removals + 1)) time
+    """
+    if end - start - max_removals <= 1:
+        # Can be cut down to a single level, which is safe whatever it is
+        return True
+    if max_removals == 0:
+        # The first step fixes the direction so one scan checks both direction and size
+        direction = 1 if levels[start + 1] > levels[start] else -1
+        return all(1 <= (levels[i + 1] - levels[i]) * direction <= MAX_LEVEL_STEP for i in range(start, end - 1))
+    return _is_safe_in_direction(levels, start, end, max_removals, 1) or _is_safe_in_direction(
+        levels, start, end, max_removals, -1
+    )
+
+
+def _is_safe_in_direction(levels: Sequence[int], start: int, end: int, max_removals: int, direction: int) -> bool:
+    """
+    Walk the levels keeping, for each one, the fewest removals that leave a safe run ending on it. A run can only
+    reach back over at most `max_removals` levels to the one before, so each level checks that many predecessors.
+    """
+    fewest_removals: list[int] = []
+    hopeless = 0
+    for i in range(start, end):
+        # Dropping everything before this level always works
+        best = i - start
+        for j in range(max(start, i - max_removals - 1), i):
+            if 1 <= (levels[i] - levels[j]) * direction <= MAX_LEVEL_STEP:
+                best = min(best, fewest_removals[j - start] + i - j - 1)
+        if best + end - 1 - i <= max_removals:
+            # Dropping everything after this level finishes a safe report
+            return True
+        hopeless = hopeless + 1 if best > max_removals else 0
+        if hopeless > max_removals:
+            # Every level a later one could follow on from already needs too many removals
             return False
-        else:
-            return self._max_absolute_difference <= 3
+        fewest_removals.append(best)
+    return False
 
 
-class Part2Report(Part1Report):
+class ReportSet:
     """
-    Implementation of report protocol with post Problem Dampener introduction
+    Every report in one contiguous buffer of levels, with `offsets[i]:offsets[i + 1]` spanning the i-th report and a
+    parallel buffer of the differences between each level and the next. Verdicts are only worked out when asked for and
+    are then kept, one byte per report for each number of removals asked about.
     """
 
-    @property
-    def is_okay(self) -> bool:
-        if super().is_okay:
+    def __init__(self, levels: array[int], offsets: array[int]) -> None:
+        self.levels = levels
+        self.offsets = offsets
+        # differences[i] is levels[i + 1] - levels[i], the entry at the last level of each report is meaningless
+        self.differences: array[int] = array("q", map(operator.sub, itertools.islice(levels, 1, None), levels))
+        self._verdicts: dict[int, bytearray] = {}
+
+    @classmethod
+    def load(cls, source: InputSource) -> "ReportSet":
+        return cls(*load_flat_reports(source))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator["ReportView"]:
+        """
+        Every report, judged with no levels removed. Use `reports` to allow removals.
+        """
+        return self.reports()
+
+    def reports(self, max_removals: int = 0) -> Iterator["ReportView"]:
+        """
+        Every report in order, each judged with up to `max_removals` levels removed
+        """
+        return (ReportView(self, index, max_removals) for index in range(len(self)))
+
+    def report(self, index: int, max_removals: int = 0) -> "ReportView":
+        if not 0 <= index < len(self):
+            raise ValueError(f"No report {index}, there are {len(self)}")
+        return ReportView(self, index, max_removals)
+
+    def is_safe(self, index: int, max_removals: int = 0) -> bool:
+        verdicts = self._verdicts.get(max_removals)
+        if verdicts is None:
+            verdicts = self._verdicts[max_removals] = bytearray(len(self))
+        if verdicts[index] == _UNCHECKED:
+            verdicts[index] = _SAFE if self._check(index, max_removals) else _UNSAFE
+        return verdicts[index] == _SAFE
+
+    def count_safe(self, max_removals: int = 0) -> int:
+        return sum(self.is_safe(index, max_removals) for index in range(len(self)))
+
+    def _check(self, index: int, max_removals: int) -> bool:
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+        if end - start <= 1:
             return True
-        else:
-            return self._is_okay_with_removed_level
-
-    @property
-    def _is_okay_with_removed_level(self) -> bool:
-        # Brute force since these are small, and it's the most readable solution
-        for i in range(self._report_length):
-            # Hit that early exit
-            if Part1Report(self.data[:i] + self.data[i + 1 :]).is_okay:
+        # Safe as it stands if its differences all fall within one of the allowed ranges, checked in C by their bounds
+        span = self.differences[start : end - 1]
+        lowest = min(span)
+        highest = max(span)
+        if (1 <= lowest and highest <= MAX_LEVEL_STEP) or (-MAX_LEVEL_STEP <= lowest and highest <= -1):
+            return True
+        # Already safe with fewer removals means safe with these, so only reports that weren't need the full check
+        for fewer in range(max_removals):
+            fewer_verdicts = self._verdicts.get(fewer)
+            if fewer_verdicts is not None and fewer_verdicts[index] == _SAFE:
                 return True
-        return False
+        return max_removals > 0 and is_safe_span(self.levels, start, end, max_removals)
 
 
-def load_reports(path: Path) -> list[list[int]]:
+class ReportView(Checkable):
     """
-    Load and parse reports into lists of ints
+    One report of a `ReportSet`, for callers that want the `Checkable` protocol. Holds no levels of its own.
     """
-    with open(path) as f:
-        report_data = list(map(lambda line: list(map(int, line.strip().split())), f.readlines()))
 
-    return report_data
+    def __init__(self, report_set: ReportSet, index: int, max_removals: int = 0) -> None:
+        self.report_set = report_set
+        self.index = index
+        self.max_removals = max_removals
 
+    @property
+    def levels(self) -> array[int]:
+        return self.report_set.levels[self.report_set.offsets[self.index] : self.report_set.offsets[self.index + 1]]
 
-def create_report_objects(
-    report_data: list[list[int]], report_factory: Callable[[list[int]], Checkable]
-) -> list[Checkable]:
-    """
-    Load a list of report data into the given report types
-    """
-    return [report_factory(report) for report in report_data]
+    @property
+    def is_okay(self) -> bool:
+        return self.report_set.is_safe(self.index, self.max_removals)
 
 
-def count_okay_reports(reports: list[Checkable]) -> int:
+@cached_parser
+def load_flat_reports(source: InputSource) -> FlatReports:
     """
-    Get the number of okay reports in a list
+    Load every report's levels into one flat array with the offsets each report starts at, rather than a list per
+    report
     """
-    return sum([report.is_okay for report in reports])
-
-
-def main() -> None:
-    report_data = load_reports(Path("data/input02.txt"))
-
-    part1_reports = create_report_objects(report_data, lambda x: Part1Report(x))
-    part2_reports = create_report_objects(report_data, lambda x: Part2Report(x))
-    print(count_okay_reports(part1_reports))
-    print(count_okay_reports(part2_reports))
+    levels: array[int] = array("q")
+    offsets: array[int] = array("q", [0])
+    for chunk in iter_line_chunks(source):
+        for line in chunk.splitlines():
+            if line.strip():
+                levels.extend(map(int, line.split()))
+                offsets.append(len(levels))
+    return levels, offsets
+
+
+def main(source: InputSource | None = None) -> None:
+    reports = ReportSet.load(day_input(source, "02"))
+    print(reports.count_safe())
+    print(reports.count_safe(DAMPENER_REMOVALS))
 
 
 if __name__ == "__main__":
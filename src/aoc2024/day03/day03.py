@@ -1,14 +1,31 @@
 import itertools
 import re
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
-from pathlib import Path
-from typing import Callable, Iterable, Optional
 
-NumberPairs = list[tuple[float, float]]
-Extractor = Callable[[str, str], NumberPairs]
+from aoc2024.input_source import (
+    InputSource,
+    day_input,
+    mapped_chunks,
+    mapped_input,
+    replayable,
+)
+
+NumberPair = tuple[float, float]
+# The groups of one match of `instruction_pattern`: a call's two operands, then the enable and disable switches, with
+# only the groups of whichever matched non-empty
+Instruction = tuple[bytes, bytes, bytes, bytes]
+Instructions = Iterator[Instruction]
+Extractor = Callable[[Instructions], Iterator[NumberPair]]
 PairOperator = Callable[[float, float], float]
 Aggregator = Callable[[Iterable[float]], float]
 
+# The enable switches are the same whatever function is being called
+ENABLE = b"do()"
+DISABLE = b"don't()"
+# The longest operands a call can have, "(123,456)"
+_LONGEST_ARGUMENTS = 9
+
 
 @dataclass
 class Day3Runner:
@@ -19,55 +36,80 @@ class Day3Runner:
     extractor: Extractor
     operation: PairOperator
     aggregation: Aggregator
-    function_name: Optional[str] = "mul"
-    pattern: str = field(init=False)
+    function_name: str = "mul"
+    pattern: re.Pattern[bytes] = field(init=False)
+    longest_instruction: int = field(init=False)
 
     def __post_init__(self) -> None:
-        self.pattern = rf"{self.function_name}\(\d{{1,3}}\,\d{{1,3}}\)"
-
-    def run(self, commands: str) -> float:
-        return self.aggregation(map(lambda pair: self.operation(*pair), self.extractor(self.pattern, commands)))
-
+        if ")" in self.function_name:
+            raise ValueError("Function names can't contain ')', the scanner relies on it only ending instructions")
+        self.pattern = instruction_pattern(self.function_name)
+        self.longest_instruction = max(len(self.function_name.encode()) + _LONGEST_ARGUMENTS, len(DISABLE))
 
-def read_input(path: Path) -> str:
-    with open(path) as f:
-        commands = "".join(map(lambda x: x.strip(), f.readlines()))
-    return commands
+    def run(self, source: InputSource) -> float:
+        with mapped_input(source) as mapped:
+            instructions = scan_instructions(self.pattern, mapped_chunks(mapped), self.longest_instruction)
+            return self.aggregation(itertools.starmap(self.operation, self.extractor(instructions)))
 
 
-def extract_numbers_from_function_call(function_call: str) -> tuple[float, float]:
+def instruction_pattern(function_name: str) -> re.Pattern[bytes]:
     """
-    Turn something like "mul(69,420)" into the tuple `(69, 420)`
+    One alternation matching a call of `function_name`, capturing its operands, or either enable switch
     """
-    split = function_call.split("(")[1].strip(")").split(",")
-    return int(split[0]), int(split[1])
+    return re.compile(
+        rb"%s\((\d{1,3}),(\d{1,3})\)|(%s)|(%s)"
+        % (re.escape(function_name.encode()), re.escape(ENABLE), re.escape(DISABLE))
+    )
 
 
-def extract_numbers(pattern: str, commands: str) -> NumberPairs:
+def scan_instructions(pattern: re.Pattern[bytes], chunks: Iterable[bytes], longest_instruction: int) -> Instructions:
     """
-    Apply the pattern assuming it will generate a list of strings the form "<func_name>(xxx, yyy)" when plugged into
-    re.findall, then strip off the function part and return a list of number tuples
+    Every match of `pattern` over the concatenated `chunks` with line breaks removed, in order.
+
+    Every instruction ends at its only `)`, so none can straddle a cut made just after one. Each chunk is scanned up to
+    its last `)` and the rest carried into the next, keeping only as much as could still start an instruction. That
+    lets `findall` build the matches in C a chunk at a time without splitting any, and nothing more than a chunk is
+    ever held.
     """
-    matches: list[str] = re.findall(pattern, commands)
-    numbers = [extract_numbers_from_function_call(match) for match in matches]
-    return numbers
+    carried = b""
+    for chunk in chunks:
+        window = carried + chunk.translate(None, b"\r\n")
+        cut = window.rfind(b")") + 1
+        instructions: list[Instruction] = pattern.findall(window, 0, cut)
+        yield from instructions
+        carried = window[max(cut, len(window) - longest_instruction + 1) :]
 
 
-def extract_numbers_in_dos(pattern: str, commands: str) -> NumberPairs:
+def extract_numbers(instructions: Instructions) -> Iterator[NumberPair]:
     """
-    Remove parts of the command string between `don't()...do()` and the extract number pairs using `extract_numbers()`
+    The operands of every call, ignoring the enable switches
     """
-    do_splits = commands.split("do()")
-    actual_dos = "".join(itertools.chain.from_iterable([do_block.split("don't()")[0] for do_block in do_splits]))
-    return extract_numbers(pattern, actual_dos)
+    for left, right, _, _ in instructions:
+        if left:
+            yield int(left), int(right)
 
 
-def main() -> None:
-    commands = read_input(Path("data/input03.txt"))
+def extract_numbers_in_dos(instructions: Instructions) -> Iterator[NumberPair]:
+    """
+    The operands of the calls made while enabled, starting enabled and switching at each `do()` and `don't()`
+    """
+    enabled = True
+    for left, right, enable, disable in instructions:
+        if enable:
+            enabled = True
+        elif disable:
+            enabled = False
+        elif enabled:
+            yield int(left), int(right)
+
+
+def main(source: InputSource | None = None) -> None:
+    # Each part scans the input for itself
+    source = replayable(day_input(source, "03"))
     part1 = Day3Runner(extract_numbers, lambda x, y: x * y, sum)
     part2 = Day3Runner(extract_numbers_in_dos, lambda x, y: x * y, sum)
-    print(part1.run(commands))
-    print(part2.run(commands))
+    print(part1.run(source))
+    print(part2.run(source))
 
 
 if __name__ == "__main__":
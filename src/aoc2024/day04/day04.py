@@ -1,13 +1,16 @@
 import itertools
 from collections import defaultdict
 from dataclasses import dataclass, field
-from pathlib import Path
 from typing import Any, DefaultDict, Generator, Iterable
 
+from aoc2024.input_source import InputSource, day_input, mapped_input, mapped_lines
+from aoc2024.memory import parse_phase
 
-def read_input(path: Path) -> list[str]:
-    with open(path) as f:
-        words = f.read().strip().split("\n")
+
+@parse_phase
+def read_input(source: InputSource) -> list[str]:
+    with mapped_input(source) as mapped:
+        words = [line.decode() for line in mapped_lines(mapped) if line.strip()]
     return words
 
 
@@ -153,8 +156,8 @@ class WordSearch:
         return (coord for coord in self.get_all_diagonals(row, col) if not self.is_out_of_bounds(*coord))
 
 
-def main() -> None:
-    words = read_input(Path("data/input04.txt"))
+def main(source: InputSource | None = None) -> None:
+    words = read_input(day_input(source, "04"))
     puzzle = WordSearch(words)
     print(puzzle.count_word_occurences("XMAS"))
     new_crosses = puzzle.get_crossword_centroids("MAS")
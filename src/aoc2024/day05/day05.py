@@ -1,22 +1,25 @@
 import functools
+import itertools
 from collections import defaultdict
-from pathlib import Path
 from typing import Any, Callable, Literal
 
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+
 RulesDict = defaultdict[int, list[int]]
 Updates = list[list[int]]
 ComparisonKeyFunction = Callable[[Any], Any]
 
 
-def parse_rules(path: Path) -> tuple[RulesDict, Updates]:
-    with open(path) as f:
-        content = f.read()
-    rules, updates = content.split("\n\n")
+@cached_parser
+def parse_rules(source: InputSource) -> tuple[RulesDict, Updates]:
+    lines = iter_lines(source)
     rule_dict: RulesDict = defaultdict(list)
-    for r in rules.split():
+    # Rules run up to the first blank line and the updates follow, both read off the same stream
+    for r in itertools.takewhile(lambda line: line.strip(), lines):
         first, after = map(int, r.split("|"))
         rule_dict[first].append(after)
-    update_list = list(map(lambda line: list(map(int, line.split(","))), updates.split()))
+    update_list = list(map(lambda line: list(map(int, line.split(","))), filter(str.strip, lines)))
     return rule_dict, update_list
 
 
@@ -44,8 +47,8 @@ def get_middle_sum(updates: Updates) -> int:
     return sum([update[len(update) // 2] for update in updates])
 
 
-def main() -> None:
-    rules, updates = parse_rules(Path("data/input05.txt"))
+def main(source: InputSource | None = None) -> None:
+    rules, updates = parse_rules(day_input(source, "05"))
     comp_key_function = get_key_function(rules)
     print(get_middle_sum(get_sorted_updates(updates, comp_key_function)))
     print(get_middle_sum(get_sorted_out_of_order(updates, comp_key_function)))
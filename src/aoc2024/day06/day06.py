@@ -2,10 +2,10 @@ import itertools
 from copy import copy, deepcopy
 from dataclasses import dataclass, field
 from math import sumprod
-from pathlib import Path
 
-from joblib import Parallel, delayed
-from tqdm import tqdm
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+from graph_utils import telemetry
 
 Coord = tuple[int, int]
 
@@ -50,9 +50,9 @@ class GuardState:
     is_looping: bool = False
 
 
-def read_input(path: Path) -> tuple[list[Coord], Coord, int]:
-    with open(path) as f:
-        maze = f.readlines()
+@cached_parser
+def read_input(source: InputSource) -> tuple[list[Coord], Coord, int]:
+    maze = list(iter_lines(source))
     obstacles: list[tuple[int, int]] = []
     start = (0, 0)
     # god I hope this is square
@@ -113,8 +113,14 @@ def update_guard_state(guard: GuardState, obstacles: list[Coord], side_length: i
 
 
 def solve1(guard: GuardState, obstacles: list[Coord], side_length: int) -> set[Coord]:
+    # Read once so a run without stats only pays for a local lookup per step
+    counting = telemetry.stats_enabled()
+    steps = 0
     while not guard.has_exited:
         guard = update_guard_state(guard, obstacles, side_length)
+        if counting:
+            steps += 1
+    telemetry.count("day06.guard_steps", steps)
     return guard.visited
 
 
@@ -125,18 +131,21 @@ def check_if_cycle(guard: GuardState, obstacles: list[Coord], side_length: int)
 
 
 def solve2(guard: GuardState, obstacles: list[Coord], side_length: int, visited: set[Coord]) -> int:
+    from joblib import Parallel, delayed
+
     visited.remove(guard.position)
     cycle_count = sum(
         # Nothing says I have a good algorithm like n_jobs=-1...
         Parallel(n_jobs=-1)(
-            delayed(check_if_cycle)(deepcopy(guard), obstacles + [coord], side_length) for coord in tqdm(visited)
+            delayed(check_if_cycle)(deepcopy(guard), obstacles + [coord], side_length)
+            for coord in telemetry.progress(visited)
         )
     )
     return cycle_count
 
 
-def main() -> None:
-    maze, start, side_length = read_input(Path("data/input06.txt"))
+def main(source: InputSource | None = None) -> None:
+    maze, start, side_length = read_input(day_input(source, "06"))
     start_guard = GuardState(start, Direction((-1, 0)))
     visited = solve1(start_guard, maze, side_length)
     print(len(visited))
@@ -1,19 +1,18 @@
 from math import prod, sumprod
-from pathlib import Path
 from typing import Callable, Iterable
 
-from joblib import Parallel, delayed
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
 
 Equation = tuple[list[int], int]
 
 
-def read_input(path: Path) -> list[Equation]:
-    with open(path) as f:
-        contents = f.read()
-
-    lines = contents.strip().split("\n")
+@cached_parser
+def read_input(source: InputSource) -> list[Equation]:
     equations = []
-    for line in lines:
+    for line in iter_lines(source):
+        if not line.strip():
+            continue
         split_line = list(map(lambda x: x.strip(), line.split(":")))
 
         equations.append((list(map(int, split_line[-1].split())), int(split_line[0])))
@@ -34,6 +33,8 @@ def evaluate_equation(eq: Equation, operators: list[Callable[[Iterable[int]], in
 
 
 def solve(equations: list[Equation], operators: list[Callable[[Iterable[int]], int]]) -> float:
+    from joblib import Parallel, delayed
+
     # noinspection PyTypeChecker
     # MyPy knows better than jetbrains
     plausible_mask = Parallel(n_jobs=-1)(delayed(evaluate_equation)(equation, operators) for equation in equations)
@@ -44,8 +45,8 @@ def integer_concate(integers: Iterable[int]) -> int:
     return int("".join(map(str, integers)))
 
 
-def main() -> None:
-    equations = read_input(Path("data/input07.txt"))
+def main(source: InputSource | None = None) -> None:
+    equations = read_input(day_input(source, "07"))
     print(solve(equations, [sum, prod]))
     print(solve(equations, [sum, prod, integer_concate]))
 
@@ -1,18 +1,20 @@
 import itertools
 from collections import defaultdict
-from pathlib import Path
 from typing import Callable
 
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+
 Coord = tuple[int, int]
 AntinodeFinder = Callable[[Coord, Coord, int], list[Coord]]
 
 
-def parse_input(path: Path) -> tuple[defaultdict[str, list[Coord]], int]:
+@cached_parser
+def parse_input(source: InputSource) -> tuple[defaultdict[str, list[Coord]], int]:
     """
     Create a mapping of node frequencies (single character) to a list of coordinates based on input file
     """
-    with open(path) as f:
-        lines = list(map(lambda s: s.strip(), f.readlines()))
+    lines = list(map(lambda s: s.strip(), iter_lines(source)))
     antenna_map: defaultdict[str, list[Coord]] = defaultdict(list)
     for i, row in enumerate(lines):
         for j, character in enumerate(row):
@@ -68,8 +70,8 @@ def solve_parts(antenna_map: defaultdict[str, list[Coord]], map_size: int, finde
     return [len(locs) for locs in finder_index_to_locations.values()]
 
 
-def main() -> None:
-    antenna_map, map_size = parse_input(Path("data/input08.txt"))
+def main(source: InputSource | None = None) -> None:
+    antenna_map, map_size = parse_input(day_input(source, "08"))
     results = solve_parts(
         antenna_map, map_size, [get_antinode_location, get_antinode_locations_with_resonant_harmonics]
     )
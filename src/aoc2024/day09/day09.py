@@ -1,20 +1,33 @@
 import itertools
 from collections import deque
-from pathlib import Path
 from typing import Protocol
 
-from tqdm import tqdm
+from aoc2024.input_source import InputSource, day_input, mapped_chunks, mapped_input
+from aoc2024.memory import parse_phase
+from graph_utils import telemetry
 
 # Tuple with index of data group and tuple of len(file) with file ids as values.
 # Using tuple so it can be removed from deque
 IndexAndGroup = tuple[int, tuple[int, ...]]
 DiskMap = list[int | str]
 
+# Maps each ASCII digit straight to its value
+_DIGIT_VALUES = bytes(range(256)).replace(b"0123456789", bytes(range(10)))
 
-def read_disk_map(path: Path) -> str:
-    with open(path) as f:
-        line = f.read().strip()
-    return line
+
+@parse_phase
+def read_disk_map(source: InputSource) -> bytearray:
+    """
+    The length of every block in the disk map, one byte each, converted from the mapped input a chunk at a time so
+    the whole map is never copied out as text
+    """
+    lengths = bytearray()
+    with mapped_input(source) as mapped:
+        for chunk in mapped_chunks(mapped):
+            lengths += chunk.translate(_DIGIT_VALUES, b" \t\r\n")
+    if lengths and max(lengths) > 9:
+        raise ValueError("The disk map can only contain digits")
+    return lengths
 
 
 class PartHandler(Protocol):
@@ -76,15 +89,15 @@ def check_sum(disk_map: DiskMap) -> int:
     return sum([i * char for i, char in enumerate(disk_map) if isinstance(char, int)])
 
 
-def main() -> None:
-    line = read_disk_map(Path("data/input09.txt"))
-    data_groups = [(i, tuple(int(line[i]) * [i // 2])) for i in range(0, len(line), 2)]
-    handlers: list[PartHandler] = [Part1Handler(data_groups, len(line)), Part2Handler(data_groups, len(line))]
+def main(source: InputSource | None = None) -> None:
+    lengths = read_disk_map(day_input(source, "09"))
+    data_groups = [(i, tuple(lengths[i] * [i // 2])) for i in range(0, len(lengths), 2)]
+    handlers: list[PartHandler] = [Part1Handler(data_groups, len(lengths)), Part2Handler(data_groups, len(lengths))]
     disk_maps: list[DiskMap] = [[], []]
 
-    for i, char in tqdm(enumerate(line)):
+    for i, length in telemetry.progress(enumerate(lengths), len(lengths)):
         for j, h in enumerate(handlers):
-            disk_maps[j] = h.handle_character(i, int(char), disk_maps[j])
+            disk_maps[j] = h.handle_character(i, length, disk_maps[j])
 
     print(check_sum(disk_maps[0]))
     print(check_sum(disk_maps[1]))
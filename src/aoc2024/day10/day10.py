@@ -2,16 +2,17 @@ import functools
 import itertools
 from copy import copy
 from itertools import zip_longest
-from pathlib import Path
+
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
 
 type TrailMap = list[list[int]]
 type Coord = tuple[int, int]
 
 
-def parse_input(path: Path) -> TrailMap:
-    with open(path) as f:
-        lines = f.read().splitlines()
-    trail_map = [list(map(int, list(line))) for line in lines]
+@cached_parser
+def parse_input(source: InputSource) -> TrailMap:
+    trail_map = [list(map(int, list(line))) for line in iter_lines(source)]
     return trail_map
 
 
@@ -94,8 +95,8 @@ def solve(trail_map: TrailMap, heads: list[Coord]) -> tuple[int, int]:
     return (summed := tuple(map(sum, zip(*scores))))[0], summed[1]
 
 
-def main() -> None:
-    trail_map = parse_input(Path("data/input10.txt"))
+def main(source: InputSource | None = None) -> None:
+    trail_map = parse_input(day_input(source, "10"))
     trail_heads = get_trailheads(trail_map)
     scores = solve(trail_map, trail_heads)
     print(scores[0])
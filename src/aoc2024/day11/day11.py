@@ -1,9 +1,11 @@
-from pathlib import Path
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, read_text
+from graph_utils import telemetry
 
 
-def read_input(path: Path) -> list[int]:
-    with open(path) as f:
-        stones = map(int, f.read().strip().split())
+@cached_parser
+def read_input(source: InputSource) -> list[int]:
+    stones = map(int, read_text(source).strip().split())
     return list(stones)
 
 
@@ -31,11 +33,13 @@ def repeated_apply(stones: list[int], apply_count: int, memo_dict: dict[tuple[in
     return result
 
 
-def main() -> None:
-    stones = read_input(Path("data/input11.txt"))
+def main(source: InputSource | None = None) -> None:
+    stones = read_input(day_input(source, "11"))
     memo_dict: dict[tuple[int, int], int] = {}
     print(repeated_apply(stones, 25, memo_dict))
+    telemetry.count("day11.memo_entries_25", len(memo_dict))
     print(repeated_apply(stones, 75, memo_dict))
+    telemetry.count("day11.memo_entries_75", len(memo_dict))
 
 
 if __name__ == "__main__":
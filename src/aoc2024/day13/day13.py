@@ -1,6 +1,9 @@
+import itertools
 import math
 import re
-from pathlib import Path
+
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
 
 
 class Claw:
@@ -40,11 +43,14 @@ class Claw:
         return a_presses * self.a_cost + b_presses * self.b_cost
 
 
-def parse_input(path: Path) -> list[list[tuple[int, int]]]:
-    with open(path) as f:
-        machines = f.read().split("\n\n")
+@cached_parser
+def parse_input(source: InputSource) -> list[list[tuple[int, int]]]:
     machine_list = []
-    for m in machines:
+    # Machines are blocks of lines separated by blank ones, joined back up one block at a time
+    for is_machine, block in itertools.groupby(iter_lines(source), key=lambda line: bool(line.strip())):
+        if not is_machine:
+            continue
+        m = "\n".join(block)
         xs = list(map(int, re.findall(r"X[+=](\d+)", m)))
         ys = list(map(int, re.findall(r"Y[+=](\d+)", m)))
         machine_list.append([(xs[i], ys[i]) for i in range(3)])
@@ -55,8 +61,8 @@ def check_machines(machines: list[Claw]) -> float:
     return sum([m.min_cost() for m in machines if m.can_get_prize])
 
 
-def main() -> None:
-    machines = parse_input(Path("data/input13.txt"))
+def main(source: InputSource | None = None) -> None:
+    machines = parse_input(day_input(source, "13"))
     machines1 = [Claw(m[0], m[1], m[2], max_per_button_presses=100) for m in machines]
     print(check_machines(machines1))
     machines2 = [
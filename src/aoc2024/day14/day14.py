@@ -1,5 +1,7 @@
 import math
-from pathlib import Path
+
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
 
 
 class Robot:
@@ -13,12 +15,10 @@ class Robot:
         self.p = ((self.p[0] + self.v[0]) % self.side_lengths[0], (self.p[1] + self.v[1]) % self.side_lengths[1])
 
 
-def parse_input(path: Path, side_legnths: tuple[int, int]) -> list[Robot]:
-    with open(path) as f:
-        lines = f.read().splitlines()
-
+@cached_parser
+def parse_input(source: InputSource, side_legnths: tuple[int, int]) -> list[Robot]:
     robot_list = []
-    for line in lines:
+    for line in iter_lines(source):
         split_line = line.split(" ")
         position_split = split_line[0].replace("p=", "").split(",")
         position = (int(position_split[0]), int(position_split[1]))
@@ -58,14 +58,15 @@ def display_robots(robots: list[Robot], side_lengths: tuple[int, int], seconds:
     )
 
 
-def main() -> None:
+def main(source: InputSource | None = None) -> None:
     side_lengths = (101, 103)
-    robots = parse_input(Path("data/input14.txt"), side_lengths)
+    initial_robots = parse_input(day_input(source, "14"), side_lengths)
+    robots = [Robot(r.p, r.v, side_lengths) for r in initial_robots]
     for _ in range(100):
         list(map(lambda x: x.update_position(), robots))
     print(math.prod(get_quadrant_counts(robots, side_lengths)))
     i = 0
-    robots = parse_input(Path("data/input14.txt"), side_lengths)
+    robots = initial_robots
     while True:
         i += 1
         list(map(lambda x: x.update_position(), robots))
@@ -1,20 +1,24 @@
 import functools
-import math
-from collections import OrderedDict
-from pathlib import Path
+from collections.abc import Iterable
 
-from graph_utils import dijkstra, sort_distance_dict
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+from graph_utils import bidirectional_dijkstra, telemetry
 
 type MazeNode = tuple[int, int, str]
 
 
-def parse_maze(path: Path) -> list[list[str]]:
-    with open(path) as f:
-        lines = list(map(list, f.read().splitlines()))
+def parse_maze(source: InputSource) -> list[list[str]]:
+    lines = list(map(list, iter_lines(source)))
 
     return lines
 
 
+@cached_parser
+def load_maze_nodes(source: InputSource) -> tuple[list[MazeNode], list[MazeNode]]:
+    return find_node_locations(parse_maze(source))
+
+
 def find_node_locations(lines: list[list[str]]) -> tuple[list[MazeNode], list[MazeNode]]:
     """
     turn the parsed file into a list of all maze nodes and a list ends for accounting for different orientation
@@ -35,12 +39,6 @@ def find_node_locations(lines: list[list[str]]) -> tuple[list[MazeNode], list[Ma
     return start + locations + end, end
 
 
-def create_distance_dict(locations: list[MazeNode]) -> OrderedDict[MazeNode, float]:
-    distances = OrderedDict({node: math.inf for node in locations})
-    distances[locations[0]] = 0
-    return sort_distance_dict(distances)
-
-
 def get_forward_and_rotational_neighbours(
     current_distance: float, current_node: MazeNode, unvisited_set: set[MazeNode]
 ) -> dict[MazeNode, float]:
@@ -50,6 +48,25 @@ def get_forward_and_rotational_neighbours(
     return neighbours
 
 
+def get_maze_edges(current_node: MazeNode, maze_nodes: set[MazeNode]) -> Iterable[tuple[MazeNode, float]]:
+    """
+    Edge getter form of `get_forward_and_rotational_neighbours`, the neighbour distances from 0 are the edge weights
+    """
+    return get_forward_and_rotational_neighbours(0, current_node, maze_nodes).items()
+
+
+def get_reverse_maze_edges(current_node: MazeNode, maze_nodes: set[MazeNode]) -> Iterable[tuple[MazeNode, float]]:
+    """
+    Edges of the reversed maze for searching back from the end, stepping backwards without turning or rotating
+    """
+    orientation_to_step = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
+    row_step, col_step = orientation_to_step[current_node[2]]
+    edges = get_rotation_neighbours(0, current_node, maze_nodes)
+    if (behind := (current_node[0] - row_step, current_node[1] - col_step, current_node[2])) in maze_nodes:
+        edges[behind] = 1.0
+    return edges.items()
+
+
 def get_forward_backward_node(
     current_distance: float, current_node: MazeNode, unvisited_set: set[MazeNode]
 ) -> dict[MazeNode, float]:
@@ -86,36 +103,23 @@ def get_rotation_neighbours(
     }
 
 
-def backtrack(
-    current_point: MazeNode,
-    node_to_previous: dict[MazeNode, set[MazeNode]],
-    optimal_set: set[MazeNode],
-    start: MazeNode,
-) -> set[MazeNode]:
-    """
-    Iterate through the previous neighbour mapping to determine all tiles visited
-    """
-    optimal_set.add(current_point)
-    if current_point == start:
-        return optimal_set
-    # noinspection PyTypeChecker
-    return functools.reduce(
-        set.union, [backtrack(n, node_to_previous, optimal_set, start) for n in node_to_previous[current_point]], set()
-    )
-
-
-def main() -> None:
+def main(source: InputSource | None = None) -> None:
     # maze = parse_maze(Path("data/sample16-2.txt"))
-    maze = parse_maze(Path("data/input16.txt"))
-    locations, ends = find_node_locations(maze)
-    distances = create_distance_dict(locations)
+    locations, ends = load_maze_nodes(day_input(source, "16"))
     start = locations[0]
     start_correct_orientation = (start[0], start[1], ">")
-    solved, visited = dijkstra(distances, get_forward_and_rotational_neighbours)
-    end = [(n, dist) for n, dist in solved.items() if n in ends][-1]
-    print(end)
-
-    print(len(set([(x[0], x[1]) for x in backtrack(end[0], visited, set(), start_correct_orientation)])))
+    maze_nodes = set(locations)
+    # Searching back from every end orientation at once means ties between them all count towards the optimal tiles
+    with telemetry.timer("day16.search"):
+        solved = bidirectional_dijkstra(
+            [start_correct_orientation],
+            ends,
+            functools.partial(get_maze_edges, maze_nodes=maze_nodes),
+            functools.partial(get_reverse_maze_edges, maze_nodes=maze_nodes),
+        )
+    print(solved.best)
+
+    print(len(set([(x[0], x[1]) for x in solved.optimal_nodes()])))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,10 @@
-import asyncio
 import itertools
-from asyncio import Queue
 from collections import deque
-from pathlib import Path
 from typing import Callable
 
-from tqdm import tqdm
+from aoc2024.input_source import InputSource, day_input, iter_lines
+from aoc2024.memory import parse_phase
+from graph_utils import telemetry
 
 type Program = list[int]
 
@@ -21,6 +20,7 @@ class Computer:
         self.rb = deque([rb], maxlen=1)
         self.rc = deque([rc], maxlen=1)
         self.instruction_pointer = 0
+        self.instructions_executed = 0
         self.op_code_to_op: dict[int, Callable[[int], int | None]] = {
             0: self.adv,
             1: self.bxl,
@@ -81,9 +81,9 @@ class Computer:
         self.instruction_pointer += 2
 
 
-def parse_program(path: Path) -> tuple[Computer, Program]:
-    with open(path) as f:
-        lines = f.read().splitlines()
+@parse_phase
+def parse_program(source: InputSource) -> tuple[Computer, Program]:
+    lines = list(iter_lines(source))
     initial_registers = list(map(lambda line: int(line.split(":")[-1].strip()), lines[:3]))
     comp = Computer(initial_registers[0], initial_registers[1], initial_registers[2])
     program = list(map(lambda x: int(x), lines[-1].split(":")[-1].split(",")))
@@ -95,12 +95,18 @@ def run_program(ra_start: int, comp: Computer, program: Program) -> list[int]:
     comp.instruction_pointer = 0
     output = []
     program_length = len(program)
+    # Read once so a run without stats only pays for a local lookup per instruction
+    counting = telemetry.stats_enabled()
+    executed = 0
     while True:
         if comp.instruction_pointer >= program_length:
             break
         result = comp.run_instruction(program[comp.instruction_pointer], program[comp.instruction_pointer + 1])
+        if counting:
+            executed += 1
         if result is not None:
             output.append(result)
+    comp.instructions_executed += executed
     return output
 
 
@@ -133,9 +139,11 @@ def iterate(comp: Computer, program: Program) -> None:
 async def brute_force(
     start: str, end_length: int, comp: Computer, program: Program, checked: set[int]
 ) -> list[int] | None:
+    from asyncio import Queue
+
     results_queue: Queue[tuple[int, list[int]]] = Queue(maxsize=20)
-    for i in tqdm(
-        itertools.product(*[range(0, 8) for _ in range(end_length)]), total=8**end_length, desc=f"{end_length}"
+    for i in telemetry.progress(
+        itertools.product(*[range(0, 8) for _ in range(end_length)]), 8**end_length, f"{end_length}"
     ):
         end = "".join(map(str, i))
         test_value = int(start + end, 8)
@@ -163,20 +171,26 @@ async def brute_force(
     return None
 
 
-def main() -> None:
-    comp, program = parse_program(Path("data/input17.txt"))
+def main(source: InputSource | None = None) -> None:
+    import asyncio
+
+    comp, program = parse_program(day_input(source, "17"))
     print(run_program(comp.ra[0], comp, program))
     # Literally guess and checked working left to right. This is only off by the last (first) digit in the output but
     # we wound up having to back up 8 digits to find the solution
     start = "3045130136122400"
     checked: set[int] = set()
-    for i in range(2, 16):
-        result = asyncio.run(brute_force(start[:-i], i, comp, program, checked))
-        if result is not None:
-            return
-    # The correct answer in octal
-    correct_octal = "3045130145714775"
-    print(run_program(int(correct_octal, 8), comp, program))
+    try:
+        for i in range(2, 16):
+            result = asyncio.run(brute_force(start[:-i], i, comp, program, checked))
+            if result is not None:
+                return
+        # The correct answer in octal
+        correct_octal = "3045130145714775"
+        print(run_program(int(correct_octal, 8), comp, program))
+    finally:
+        telemetry.count("day17.candidates_checked", len(checked))
+        telemetry.count("day17.instructions", comp.instructions_executed)
 
 
 if __name__ == "__main__":
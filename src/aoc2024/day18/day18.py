@@ -1,64 +1,39 @@
-import functools
-import itertools
 import math
-from collections import OrderedDict
-from copy import deepcopy
-from pathlib import Path
 
-from graph_utils import dijkstra, get_neighbours
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+from graph_utils import GridGraph, a_star, first_blocking_index
 
 type Coord = tuple[int, int]
 
 
-def get_bytes(path: Path) -> list[Coord]:
-    with open(path) as f:
-        lines = f.read().splitlines()
-    return list(map(lambda x: (int((coords := x.strip("()").split(","))[1]), int(coords[0])), lines))
+@cached_parser
+def get_bytes(source: InputSource) -> list[Coord]:
+    return list(map(lambda x: (int((coords := x.strip("()").split(","))[1]), int(coords[0])), iter_lines(source)))
 
 
-def can_escape(distances: OrderedDict[Coord, float], byte_list: list[Coord], max_row: int, max_col: int) -> bool:
-    distances, _ = dijkstra(
-        distances, functools.partial(get_neighbours, obstacles=set(byte_list), max_row=max_row, max_col=max_col)
-    )
-    return math.isfinite(distances[(max_row, max_col)])
-
-
-def binary_search(
-    distances: OrderedDict[Coord, float],
-    upper_n_bytes: int,
-    lower_n_bytes: int,
-    byte_list: list[Coord],
-    max_row: int,
-    max_col: int,
-) -> int:
-    n_bytes = lower_n_bytes + (upper_n_bytes - lower_n_bytes) // 2
-    can_escape_lower = can_escape(deepcopy(distances), byte_list[: (n_bytes - 1)], max_row, max_col)
-    can_escape_upper = can_escape(deepcopy(distances), byte_list[:n_bytes], max_row, max_col)
-    if can_escape_lower and not can_escape_upper:
-        return n_bytes
-    elif can_escape_lower and can_escape_upper:
-        return binary_search(distances, upper_n_bytes, n_bytes - 1, byte_list, max_row, max_col)
-    else:
-        return binary_search(distances, n_bytes + 1, lower_n_bytes, byte_list, max_row, max_col)
+def shortest_escape(byte_list: list[Coord], max_row: int, max_col: int) -> float:
+    """
+    Number of steps from the top left to the bottom right corner with `byte_list` fallen, `math.inf` if blocked
+    """
+    end = (max_row, max_col)
+    distances, _ = a_star([(0, 0)], GridGraph(max_row, max_col, byte_list), [end])
+    return distances.get(end, math.inf)
 
 
-def main() -> None:
-    max_row = 70
-    max_col = 70
-    n_bytes = 1024
-    byte_queue = get_bytes(Path("data/input18.txt"))
+def main(source: InputSource | None = None, max_coordinate: int = 70, n_bytes: int = 1024) -> None:
+    """
+    The size of the memory space and how many bytes have fallen for part 1 come from the puzzle text, not the input
+    """
+    byte_queue = get_bytes(day_input(source, "18"))
 
-    placed_bytes = set(byte_queue[:n_bytes])
-    all_coords = itertools.product(range(max_row + 1), range(max_col + 1))
-    distances = OrderedDict({coord: math.inf for coord in all_coords if coord not in placed_bytes})
-    distances[(0, 0)] = 0
-    solved_dists, _ = dijkstra(
-        deepcopy(distances),
-        functools.partial(get_neighbours, obstacles=placed_bytes, max_row=max_row, max_col=max_col),
+    print(shortest_escape(byte_queue[:n_bytes], max_coordinate, max_coordinate))
+    first_byte_index = first_blocking_index(
+        GridGraph(max_coordinate, max_coordinate), byte_queue, (0, 0), (max_coordinate, max_coordinate)
     )
-    print(solved_dists[(70, 70)])
-    first_byte_count = binary_search(distances, len(byte_queue), 1024, byte_queue, max_row, max_col)
-    first_byte_coord = byte_queue[first_byte_count - 1]
+    if first_byte_index is None:
+        raise ValueError("The falling bytes never block the exit")
+    first_byte_coord = byte_queue[first_byte_index]
     print(f"{first_byte_coord[1]},{first_byte_coord[0]}")
 
 
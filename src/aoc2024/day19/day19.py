@@ -1,10 +1,13 @@
-from pathlib import Path
 from typing import Callable, Iterable
 
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, read_text
+from graph_utils import telemetry
 
-def parse_input(path: Path) -> tuple[list[str], list[str]]:
-    with open(path) as f:
-        blocks = f.read().split("\n\n")
+
+@cached_parser
+def parse_input(source: InputSource) -> tuple[list[str], list[str]]:
+    blocks = read_text(source).split("\n\n")
     available = list(map(lambda s: s.strip(), blocks[0].split(",")))
     desired = blocks[1].splitlines()
     return available, desired
@@ -26,9 +29,11 @@ def try_to_match(
     return memo_dict[desired]
 
 
-def main() -> None:
-    available, desired = parse_input(Path("data/input19.txt"))
+def main(source: InputSource | None = None) -> None:
+    available, desired = parse_input(day_input(source, "19"))
     can_match_dict: dict[str, int] = {}
     print(sum(try_to_match(d, available, can_match_dict, lambda x: int(any(x))) for d in desired))
     combo_count_dict: dict[str, int] = {}
     print(sum(try_to_match(d, available, combo_count_dict, sum) for d in desired))
+    telemetry.count("day19.memo_entries_part1", len(can_match_dict))
+    telemetry.count("day19.memo_entries_part2", len(combo_count_dict))
@@ -1,19 +1,23 @@
-import functools
 import itertools
-import math
-from collections import OrderedDict
 from pathlib import Path
 
-from tqdm import tqdm
-
-from graph_utils import dijkstra, get_neighbours
+from aoc2024.input_cache import cached_parser
+from aoc2024.input_source import InputSource, day_input, iter_lines
+from aoc2024.paths import CACHE_DIRECTORY
+from graph_utils import (
+    DistanceFieldCache,
+    GridGraph,
+    breadth_first,
+    distance_field_key,
+    telemetry,
+)
 
 type Coord = tuple[int, int]
 
 
-def parse_input(path: Path) -> tuple[Coord, Coord, list[Coord], list[Coord], int, int]:
-    with open(path) as f:
-        lines = f.read().splitlines()
+@cached_parser
+def parse_input(source: InputSource) -> tuple[Coord, Coord, list[Coord], list[Coord], int, int]:
+    lines = list(iter_lines(source))
     walls = []
     track = []
     start: Coord = (0, 0)
@@ -34,29 +38,21 @@ def parse_input(path: Path) -> tuple[Coord, Coord, list[Coord], list[Coord], int
     return start, end, walls, [start] + track + [end], max_row, max_col
 
 
-def backtrack(
-    current_point: Coord,
-    node_to_previous: dict[Coord, set[Coord]],
-    optimal_set: list[Coord],
-    start: Coord,
-) -> list[Coord]:
+def get_distances_to_end(
+    start: Coord, walls: list[Coord], max_row: int, max_col: int, input_path: Path | None = None
+) -> dict[Coord, float]:
     """
-    Iterate through the previous neighbour mapping to determine all tiles visited
+    Distance from `start` to every track cell. Given the `input_path` the grid was parsed from, the field is cached on
+    disk against the file's contents so repeat runs skip the search.
     """
-    optimal_set.append(current_point)
-    if current_point == start:
-        optimal_set.append(current_point)
-        return list(reversed(optimal_set))
-    return backtrack(node_to_previous[current_point].pop(), node_to_previous, optimal_set, start)
 
+    def search() -> tuple[dict[Coord, float], dict[Coord, set[Coord]]]:
+        return breadth_first([start], GridGraph(max_row, max_col, walls))
 
-def get_distances_to_end(
-    start: Coord, all_coords: list[Coord], walls: set[Coord], max_row: int, max_col: int
-) -> dict[Coord, float]:
-    distances = OrderedDict({coord: math.inf for coord in all_coords if coord not in walls})
-    distances[start] = 0
-    solved, blah = dijkstra(
-        distances, functools.partial(get_neighbours, obstacles=walls, max_row=max_row, max_col=max_col)
+    if input_path is None:
+        return search()[0]
+    solved, _ = DistanceFieldCache(CACHE_DIRECTORY / "distance_fields").get_or_solve(
+        distance_field_key(input_path, "day20", "breadth_first", start), search
     )
     return solved
 
@@ -64,17 +60,23 @@ def get_distances_to_end(
 def solve(distances: dict[Coord, float], track: list[Coord], max_cheat_time: int) -> list[float]:
     saves = []
 
-    for a, b in tqdm(itertools.permutations(track, 2)):
-        if 1 < (taxi_dist := abs(a[0] - b[0]) + abs(a[1] - b[1])) <= max_cheat_time:
-            save = distances[a] - distances[b] - taxi_dist
-            if save >= 100:
-                saves.append(save)
+    pair_count = len(track) * (len(track) - 1)
+    with telemetry.timer(f"day20.cheats_up_to_{max_cheat_time}"):
+        for a, b in telemetry.progress(itertools.permutations(track, 2), pair_count, f"cheats up to {max_cheat_time}"):
+            if 1 < (taxi_dist := abs(a[0] - b[0]) + abs(a[1] - b[1])) <= max_cheat_time:
+                save = distances[a] - distances[b] - taxi_dist
+                if save >= 100:
+                    saves.append(save)
+    telemetry.count("day20.pairs_checked", pair_count)
     return saves
 
 
-def main() -> None:
-    start, end, walls, track, max_row, max_col = parse_input(Path("data/input20.txt"))
-    wall_set = set(walls)
-    dists_to_end = get_distances_to_end(start, track, wall_set, max_row, max_col)
+def main(source: InputSource | None = None) -> None:
+    source = day_input(source, "20")
+    start, end, walls, track, max_row, max_col = parse_input(source)
+    # Only a file has contents stable enough to cache the distance field against
+    input_path = source if isinstance(source, Path) else None
+    with telemetry.timer("day20.distance_field"):
+        dists_to_end = get_distances_to_end(start, walls, max_row, max_col, input_path)
     print(len(solve(dists_to_end, track, 2)))
     print(len(solve(dists_to_end, track, 20)))
@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def measure_import_times(day: str) -> list[ImportTiming]:
+    """
+    Import the CLI and `day` in a fresh interpreter under `-X importtime`, so nothing is already in `sys.modules`, and
+    parse the timings it reports for the CLI and the day, leaving out interpreter startup. `depth` 0 entries are the
+    modules the command imported directly.
+    """
+    source_directory = str(Path(__file__).parent.parent)
+    python_path = os.pathsep.join(path for path in (source_directory, os.environ.get("PYTHONPATH")) if path)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import aoc2024.run_day, aoc2024.{day}.{day}"],
+        env=os.environ | {"PYTHONPATH": python_path},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings: list[ImportTiming] = []
+    # Each module is reported after everything it imported, so a tree is complete when its depth 0 root shows up
+    tree: list[ImportTiming] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        # -X importtime indents each level of nesting by two spaces after the first one
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        tree.append(ImportTiming(name.strip(), depth, int(self_us), int(cumulative_us)))
+        if depth == 0:
+            # Skip what the interpreter imports for itself before running the command
+            if tree[-1].module.startswith("aoc2024"):
+                timings.extend(tree)
+            tree = []
+    return timings
+
+
+def format_import_times(timings: list[ImportTiming], top: int = 20) -> str:
+    top_level = [timing for timing in timings if timing.depth == 0]
+    total_ms = sum(timing.cumulative_us for timing in top_level) / 1000
+    lines = [f"{len(timings)} modules imported in {total_ms:.1f} ms", "", f"{'cumulative (ms)':>16}  direct imports"]
+    lines += [f"{timing.cumulative_us / 1000:>16.1f}  {timing.module}" for timing in top_level]
+    lines += ["", f"{'self (ms)':>16}{'cumulative (ms)':>17}  slowest modules"]
+    lines += [
+        f"{timing.self_us / 1000:>16.1f}{timing.cumulative_us / 1000:>17.1f}  {timing.module}"
+        for timing in sorted(timings, key=lambda timing: timing.self_us, reverse=True)[:top]
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+import functools
+import hashlib
+import os
+import pickle
+import struct
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Concatenate
+
+from aoc2024.input_source import InputSource
+from aoc2024.memory import parse_phase
+from aoc2024.paths import CACHE_DIRECTORY
+
+PARSED_CACHE_DIRECTORY = CACHE_DIRECTORY / "parsed"
+# The same switch graph_utils.cache reads, so one variable turns off every cache
+BYPASS_ENVIRONMENT_VARIABLE = "AOC_NO_CACHE"
+
+# magic, pickle length, out of band buffer count, followed by one length per buffer
+_HEADER = struct.Struct("<4sQQ")
+_BUFFER_LENGTH = struct.Struct("<Q")
+_MAGIC = b"AOCP"
+
+
+def cached_parser[**P, R](parser: Callable[Concatenate[InputSource, P], R]) -> Callable[Concatenate[InputSource, P], R]:
+    """
+    Cache what a day's parser returns for an input file on disk, so a warm run unpickles it instead of parsing again.
+    Inputs that aren't files (bytes, stdin) are always parsed since there is nothing stable to key them on.
+
+    Entries are keyed by the resolved path, its mtime, a hash of its contents, the other arguments and a hash of the
+    parser's module source, so editing either the input or the day invalidates them. Each call returns a freshly
+    unpickled object that is safe to mutate. Results are written with pickle protocol 5 and any buffers pickle can
+    hand over out of band (`bytearray`, `PickleBuffer`) are stored raw after the pickle rather than copied into it.
+    Only the newest entry per parser and path is kept, and one that can't be read is deleted and parsed again. Set
+    `AOC_NO_CACHE` to parse every time. Cached parsers also mark the end of the parse phase for `aoc2024.memory`.
+    """
+
+    @functools.wraps(parser)
+    def parse(source: InputSource, /, *args: P.args, **kwargs: P.kwargs) -> R:
+        if not isinstance(source, Path) or os.environ.get(BYPASS_ENVIRONMENT_VARIABLE):
+            return parser(source, *args, **kwargs)
+        resolved = source.resolve()
+        slot = hashlib.sha256(f"{parser.__module__}.{parser.__qualname__}:{resolved}".encode()).hexdigest()[:16]
+        key = hashlib.sha256()
+        key.update(str(resolved.stat().st_mtime_ns).encode())
+        with open(resolved, "rb") as f:
+            # Hashed in chunks rather than read whole
+            key.update(hashlib.file_digest(f, "sha256").digest())
+        key.update(_module_source_hash(parser.__module__))
+        key.update(repr((args, sorted(kwargs.items()))).encode())
+        entry = PARSED_CACHE_DIRECTORY / f"{slot}-{key.hexdigest()[:32]}.pickle"
+        if entry.exists():
+            try:
+                cached: R = _load(entry)
+                return cached
+            except Exception:
+                # Unpickling a truncated or corrupt entry can raise almost anything, none of it should stop the day
+                entry.unlink(missing_ok=True)
+        parsed = parser(source, *args, **kwargs)
+        _store(entry, parsed)
+        for stale in PARSED_CACHE_DIRECTORY.glob(f"{slot}-*.pickle"):
+            if stale != entry:
+                stale.unlink(missing_ok=True)
+        return parsed
+
+    return parse_phase(parse)
+
+
+@functools.cache
+def _module_source_hash(module_name: str) -> bytes:
+    module_file = getattr(sys.modules[module_name], "__file__", None)
+    return hashlib.sha256(Path(module_file).read_bytes()).digest() if module_file else b""
+
+
+def _store(entry: Path, parsed: object) -> None:
+    # Only needed on a miss, a warm run shouldn't pay for importing it
+    import tempfile
+
+    buffers: list[pickle.PickleBuffer] = []
+    pickled = pickle.dumps(parsed, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename so a crashed or concurrent run never leaves a half written entry
+    with tempfile.NamedTemporaryFile(dir=entry.parent, suffix=".tmp", delete=False) as f:
+        f.write(_HEADER.pack(_MAGIC, len(pickled), len(raw_buffers)))
+        for raw in raw_buffers:
+            f.write(_BUFFER_LENGTH.pack(raw.nbytes))
+        f.write(pickled)
+        for raw in raw_buffers:
+            f.write(raw)
+    os.replace(f.name, entry)
+
+
+def _load(entry: Path) -> Any:
+    data = memoryview(entry.read_bytes())
+    magic, pickle_length, buffer_count = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError(f"{entry} is not a parsed input cache entry")
+    position = _HEADER.size
+    buffer_lengths = []
+    for _ in range(buffer_count):
+        buffer_lengths.append(_BUFFER_LENGTH.unpack_from(data, position)[0])
+        position += _BUFFER_LENGTH.size
+    if position + pickle_length + sum(buffer_lengths) != len(data):
+        raise ValueError(f"{entry} is truncated")
+    pickled = data[position : (position := position + pickle_length)]
+    buffers = []
+    for length in buffer_lengths:
+        buffers.append(data[position : (position := position + length)])
+    return pickle.loads(pickled, buffers=buffers)
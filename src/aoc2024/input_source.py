@@ -0,0 +1,121 @@
+import contextlib
+import io
+import mmap
+import os
+import stat
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+from aoc2024.paths import default_input
+
+# A file on disk, the whole input already in memory, or a binary stream such as `sys.stdin.buffer`
+type InputSource = Path | bytes | BinaryIO
+# What `mapped_input` hands out, both support `find`, `len` and slicing to bytes
+type MappedInput = mmap.mmap | bytes
+
+
+def day_input(source: InputSource | None, day: str) -> InputSource:
+    """
+    `source`, or the day's own input file if none was given
+    """
+    return default_input(day) if source is None else source
+
+
+def replayable(source: InputSource) -> Path | bytes:
+    """
+    A stream can only be read once, so one is read into memory for days that go over their input more than once
+    """
+    if isinstance(source, (Path, bytes)):
+        return source
+    return source.read()
+
+
+@contextlib.contextmanager
+def open_binary(source: InputSource) -> Iterator[BinaryIO]:
+    if isinstance(source, Path):
+        with open(source, "rb") as f:
+            yield f
+    elif isinstance(source, bytes):
+        yield io.BytesIO(source)
+    else:
+        # Not ours to close
+        yield source
+
+
+def iter_lines(source: InputSource) -> Iterator[str]:
+    """
+    Lines of `source` without their line endings, read one at a time so only the current line is held in memory
+    """
+    with open_binary(source) as f:
+        for line in f:
+            yield line.decode().rstrip("\r\n")
+
+
+def iter_line_chunks(source: InputSource, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """
+    The raw input in chunks of roughly `chunk_size` bytes, each ending at a line break (or the end of the input) so no
+    line is ever split between two chunks
+    """
+    with open_binary(source) as f:
+        carried = b""
+        while chunk := f.read(chunk_size):
+            end = chunk.rfind(b"\n") + 1
+            if end == 0:
+                carried += chunk
+                continue
+            yield carried + chunk[:end]
+            carried = chunk[end:]
+        if carried:
+            yield carried
+
+
+def read_text(source: InputSource) -> str:
+    with open_binary(source) as f:
+        return f.read().decode()
+
+
+@contextlib.contextmanager
+def mapped_input(source: InputSource) -> Iterator[MappedInput]:
+    """
+    A read only view of the whole input. Regular files are memory mapped so the pages are only read as they are
+    touched and are never copied onto the heap, bytes are used as they are and anything else (a pipe, an empty
+    file) is read into memory.
+    """
+    if isinstance(source, bytes):
+        yield source
+        return
+    with open_binary(source) as f:
+        mapped = None
+        with contextlib.suppress(OSError, ValueError, io.UnsupportedOperation):
+            descriptor = f.fileno()
+            info = os.fstat(descriptor)
+            if stat.S_ISREG(info.st_mode) and info.st_size > 0:
+                mapped = mmap.mmap(descriptor, 0, access=mmap.ACCESS_READ)
+        if mapped is None:
+            yield f.read()
+            return
+        with mapped:
+            yield mapped
+
+
+def mapped_chunks(mapped: MappedInput, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """
+    A mapped input in consecutive `chunk_size` byte pieces, which can split lines and anything else in two
+    """
+    for position in range(0, len(mapped), chunk_size):
+        yield mapped[position : position + chunk_size]
+
+
+def mapped_lines(mapped: MappedInput) -> Iterator[bytes]:
+    """
+    Lines of a mapped input without their line endings, each copied out of the map only when it is reached
+    """
+    position = 0
+    size = len(mapped)
+    while position < size:
+        end = mapped.find(b"\n", position)
+        if end == -1:
+            end = size
+        yield mapped[position:end].rstrip(b"\r")
+        position = end + 1
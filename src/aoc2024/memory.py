@@ -0,0 +1,245 @@
+import contextlib
+import functools
+import importlib
+import io
+import os
+import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Protocol, TextIO, cast
+
+# Every day imports this for `parse_phase` through its parsers, so anything only measuring needs is imported there
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+
+# Every day parses its input, prints part 1, then solves and prints part 2
+PHASES = ("parse", "part 1", "part 2")
+
+
+class ParseListener(Protocol):
+    def end_parse(self) -> None: ...
+
+
+# Set while a day is being measured (by `measure_memory` or the benchmarks) so parsers can mark where parsing ends
+_parse_listener: ParseListener | None = None
+
+
+@dataclass
+class PhaseMemory:
+    """
+    Peak memory over one phase of a day. `top_sites` are the lines whose allocations made up most of the growth in
+    traced memory from the start of the phase to its end, as `file:line: +size`.
+    """
+
+    phase: str
+    peak_rss_kib: int
+    traced_peak_bytes: int
+    top_sites: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MemoryReport:
+    day: str
+    status: str
+    phases: list[PhaseMemory]
+
+    @property
+    def peak_rss_kib(self) -> int:
+        return max((phase.peak_rss_kib for phase in self.phases), default=0)
+
+    def exceeds(self, budget_mib: float) -> bool:
+        return self.peak_rss_kib > budget_mib * 1024
+
+
+def parse_phase[**P, R](parser: Callable[P, R]) -> Callable[P, R]:
+    """
+    Mark `parser` as reading a day's input, so when a day is being measured the first time it returns ends the parse
+    phase. Costs one global lookup per call otherwise.
+    """
+
+    @functools.wraps(parser)
+    def parse(*args: P.args, **kwargs: P.kwargs) -> R:
+        parsed = parser(*args, **kwargs)
+        if _parse_listener is not None:
+            _parse_listener.end_parse()
+        return parsed
+
+    return parse
+
+
+@contextlib.contextmanager
+def listening_for_parse(listener: ParseListener) -> Iterator[None]:
+    """
+    Call `listener.end_parse()` every time a `parse_phase` parser returns inside the block
+    """
+    global _parse_listener
+    previous = _parse_listener
+    _parse_listener = listener
+    try:
+        yield
+    finally:
+        _parse_listener = previous
+
+
+def measure_memory(day: str, top: int = 5) -> MemoryReport:
+    """
+    Run a day in a fresh process and report the peak resident set size and the peak memory traced by tracemalloc for
+    each of its phases, with the `top` allocation sites of each. The day's output is printed as usual.
+
+    Caches are bypassed so parsing does its real work. The parse phase runs until the first parser marked with
+    `parse_phase` returns, part 1 until the day prints its first line and part 2 until it returns. A day that parses
+    lazily inside part 1 reports no parse phase and one that solves both parts before printing either reports all of
+    it under part 1. Peak RSS is reset between phases through `/proc/self/clear_refs`, where that isn't available
+    each phase reports the peak of the whole process so far. Both figures include tracemalloc's own overhead, so
+    compare them between runs rather than against an unmeasured run.
+    """
+    # Only needed here, a plain run of a day shouldn't pay for importing it
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_measure_in_process, args=(day, top, sender))
+    process.start()
+    sender.close()
+    process.join()
+    if receiver.poll():
+        report: MemoryReport = receiver.recv()
+        return report
+    return MemoryReport(day, "crashed", [])
+
+
+def format_memory_report(report: MemoryReport, budget_mib: float | None = None) -> str:
+    lines = [f"{'phase':>8}{'peak RSS (MiB)':>16}{'traced peak (MiB)':>19}"]
+    for phase in report.phases:
+        lines.append(
+            f"{phase.phase:>8}{phase.peak_rss_kib / 1024:>16.1f}{phase.traced_peak_bytes / 1024 / 1024:>19.1f}"
+        )
+    if report.status != "ok":
+        lines.append(f"{report.day} {report.status}")
+    if budget_mib is not None and report.exceeds(budget_mib):
+        lines.append(f"{report.day} peaked at {report.peak_rss_kib / 1024:.1f} MiB, over the {budget_mib:g} MiB budget")
+    for phase in report.phases:
+        if phase.top_sites:
+            lines.append(f"top allocation sites, {phase.phase}:")
+            lines.extend(f"  {site}" for site in phase.top_sites)
+    return "\n".join(lines)
+
+
+class _PhaseTracker:
+    def __init__(self, top: int) -> None:
+        self.top = top
+        self.phase = 0
+        self.phases: list[PhaseMemory] = []
+        # Only the per line totals are kept between phases, a whole snapshot would count towards the next phase
+        self.line_sizes = _traced_line_sizes()
+        self._reset_peaks()
+
+    def end_parse(self) -> None:
+        if self.phase == 0:
+            self._end_phase()
+
+    def end_line(self) -> None:
+        if self.phase == 0:
+            # Nothing marked the end of parsing, so it happened as part of part 1
+            self.phase = 1
+        if self.phase == 1:
+            self._end_phase()
+
+    def finish(self, completed: bool = True) -> list[PhaseMemory]:
+        """
+        End the phase the day is in and, if it ran to completion, any it skipped by never marking them
+        """
+        self._end_phase()
+        while completed and self.phase < len(PHASES):
+            self._end_phase()
+        return self.phases
+
+    def _end_phase(self) -> None:
+        import tracemalloc
+
+        # Read before taking the snapshot, which allocates plenty of its own
+        _, traced_peak = tracemalloc.get_traced_memory()
+        peak_rss_kib = _peak_rss_kib()
+        line_sizes = _traced_line_sizes()
+        growth = sorted(
+            ((size - self.line_sizes.get(line, 0), line) for line, size in line_sizes.items()), reverse=True
+        )
+        top_sites = [
+            f"{filename}:{lineno}: +{size / 1024:.1f} KiB"
+            for size, (filename, lineno) in growth[: self.top]
+            if size > 0
+        ]
+        self.phases.append(PhaseMemory(PHASES[self.phase], peak_rss_kib, traced_peak, top_sites))
+        self.phase += 1
+        self.line_sizes = line_sizes
+        self._reset_peaks()
+
+    def _reset_peaks(self) -> None:
+        import tracemalloc
+
+        tracemalloc.reset_peak()
+        with contextlib.suppress(OSError):
+            # Writing 5 resets the kernel's high water mark for this process, see proc(5)
+            Path("/proc/self/clear_refs").write_text("5")
+
+
+class _LineWatcher(io.TextIOBase):
+    """
+    Passes writes through to `stream`, telling `tracker` whenever a full line has gone out
+    """
+
+    def __init__(self, stream: TextIO, tracker: _PhaseTracker) -> None:
+        self.stream = stream
+        self.tracker = tracker
+
+    def write(self, text: str) -> int:
+        written = self.stream.write(text)
+        if "\n" in text:
+            self.tracker.end_line()
+        return written
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _measure_in_process(day: str, top: int, sender: "Connection") -> None:
+    import tracemalloc
+
+    # Measure real parsing rather than unpickling a cached result
+    os.environ["AOC_NO_CACHE"] = "1"
+    day_main = importlib.import_module(f"aoc2024.{day}.{day}").main
+    status = "ok"
+    tracemalloc.start()
+    tracker = _PhaseTracker(top)
+    try:
+        with listening_for_parse(tracker), contextlib.redirect_stdout(cast(TextIO, _LineWatcher(sys.stdout, tracker))):
+            day_main()
+    except Exception as e:
+        status = "error"
+        print(f"{type(e).__name__}: {e}", file=sys.stderr)
+    phases = tracker.finish(status == "ok")
+    tracemalloc.stop()
+    sys.stdout.flush()
+    sender.send(MemoryReport(day, status, phases))
+    sender.close()
+
+
+def _traced_line_sizes() -> dict[tuple[str, int], int]:
+    import tracemalloc
+
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    )
+    return {(stat.traceback[0].filename, stat.traceback[0].lineno): stat.size for stat in snapshot.statistics("lineno")}
+
+
+def _peak_rss_kib() -> int:
+    with contextlib.suppress(OSError):
+        for line in Path("/proc/self/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    import resource
+
+    # Linux reports this in KiB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
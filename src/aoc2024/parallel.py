@@ -0,0 +1,115 @@
+import contextlib
+import importlib
+import io
+import json
+import multiprocessing
+import sys
+import time
+import traceback
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from aoc2024.input_source import InputSource
+from aoc2024.paths import CACHE_DIRECTORY
+
+TIMINGS_PATH = CACHE_DIRECTORY / "timings.json"
+
+
+@dataclass
+class DayOutcome:
+    """
+    Result of running one day in its own process. `cpu_time` only covers that process, not any pool it starts.
+    """
+
+    day: str
+    status: str
+    wall_time: float
+    cpu_time: float
+    output: str
+
+
+def run_days_in_parallel(days: Iterable[str], workers: int | None = None) -> list[DayOutcome]:
+    """
+    Run every day in a fresh process, at most `workers` at a time, slowest first according to the timings saved by the
+    last run (days with no timing yet count as slowest). Each day's stdout and stderr are captured and printed as one
+    block when it finishes, and a table of every day's wall time, CPU time and status is printed at the end.
+    """
+    previous_timings = load_timings()
+    ordered = sorted(days, key=lambda day: -previous_timings.get(day, float("inf")))
+    outcomes = []
+    start = time.perf_counter()
+    # One task per child so no imported module or global state carries over from one day to the next
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn"), max_tasks_per_child=1
+    ) as pool:
+        futures = {pool.submit(run_captured, day): day for day in ordered}
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except BrokenProcessPool:
+                outcome = DayOutcome(futures[future], "crashed", 0.0, 0.0, "worker process died\n")
+            print(f"Running: {outcome.day}\n{outcome.output}", end="", flush=True)
+            outcomes.append(outcome)
+    outcomes.sort(key=lambda outcome: outcome.day)
+    print(format_report(outcomes, time.perf_counter() - start))
+    save_timings(previous_timings | {outcome.day: outcome.wall_time for outcome in outcomes if outcome.status == "ok"})
+    return outcomes
+
+
+def run_captured(day: str, source: InputSource | None = None) -> DayOutcome:
+    """
+    Import and run a day (on `source` if given, otherwise its own input) with its output captured, turning any
+    exception into an `error` outcome with the traceback
+    """
+    output = io.StringIO()
+    status = "ok"
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+        try:
+            importlib.import_module(f"aoc2024.{day}.{day}").main(source)
+        except Exception:
+            status = "error"
+            traceback.print_exc()
+        _print_stats()
+    return DayOutcome(day, status, time.perf_counter() - wall_start, time.process_time() - cpu_start, output.getvalue())
+
+
+def format_report(outcomes: list[DayOutcome], total_wall_time: float) -> str:
+    lines = [f"{'day':<8}{'status':<10}{'wall (s)':>10}{'cpu (s)':>10}"]
+    for outcome in outcomes:
+        lines.append(f"{outcome.day:<8}{outcome.status:<10}{outcome.wall_time:>10.3f}{outcome.cpu_time:>10.3f}")
+    total_cpu_time = sum(outcome.cpu_time for outcome in outcomes)
+    failed = sum(outcome.status != "ok" for outcome in outcomes)
+    lines.append(f"{'total':<8}{f'{failed} failed':<10}{total_wall_time:>10.3f}{total_cpu_time:>10.3f}")
+    return "\n".join(lines)
+
+
+def load_timings() -> dict[str, float]:
+    try:
+        with open(TIMINGS_PATH) as f:
+            timings: dict[str, float] = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return timings
+
+
+def save_timings(timings: dict[str, float]) -> None:
+    TIMINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(TIMINGS_PATH, "w") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+
+
+def _print_stats() -> None:
+    """
+    Counters and timers switched on with `--stats` are inherited through the environment, print them with the output
+    """
+    if "graph_utils.telemetry" not in sys.modules:
+        return
+    from graph_utils import telemetry
+
+    if telemetry.stats_enabled():
+        print(telemetry.format_stats())
+        telemetry.reset()
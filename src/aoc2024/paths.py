@@ -0,0 +1,30 @@
+import os
+from pathlib import Path
+
+ROOT_ENVIRONMENT_VARIABLE = "AOC_ROOT"
+
+
+def _find_project_root() -> Path:
+    """
+    `AOC_ROOT` if it's set, otherwise the checkout this package is running from, otherwise the working directory (for
+    an installed package, where the directory above the package is site-packages)
+    """
+    if root := os.environ.get(ROOT_ENVIRONMENT_VARIABLE):
+        return Path(root).absolute()
+    checkout = Path(__file__).parent.parent.parent
+    if (checkout / "pyproject.toml").exists():
+        return checkout
+    return Path.cwd()
+
+
+# Everything the runner reads or writes lives under here, so nothing depends on the working directory
+PROJECT_ROOT = _find_project_root()
+DATA_DIRECTORY = PROJECT_ROOT / "data"
+CACHE_DIRECTORY = PROJECT_ROOT / ".cache"
+
+
+def default_input(day: str) -> Path:
+    """
+    Where a day's own puzzle input lives, `day` being either `"day06"` or just `"06"`
+    """
+    return DATA_DIRECTORY / f"input{day.removeprefix("day")}.txt"
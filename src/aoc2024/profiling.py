@@ -0,0 +1,100 @@
+import cProfile
+import importlib
+import pstats
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+from aoc2024.paths import CACHE_DIRECTORY
+
+PROFILE_DIRECTORY = CACHE_DIRECTORY / "profiles"
+PROFILERS = ("cprofile", "tracemalloc")
+# Call paths worth less than this many seconds are dropped from the collapsed stacks
+_MIN_STACK_TIME = 1e-6
+
+type FunctionKey = tuple[str, int, str]
+
+
+def profile_day(day: str, profiler: str, top: int = 20, output_directory: Path = PROFILE_DIRECTORY) -> list[Path]:
+    """
+    Run a day under `profiler`, write its results to `output_directory` and print the `top` entries.
+
+    `cprofile` writes `<day>.prof` (load it with `pstats` or snakeviz) and prints the functions with the most
+    cumulative time. `tracemalloc` writes a `<day>.tracemalloc` snapshot (load it with `tracemalloc.Snapshot.load`)
+    and prints the lines holding the most memory when the day finished, along with the peak. Both also write
+    `<day>.collapsed`, one `frame;frame;frame value` line per stack, which flamegraph.pl, speedscope and inferno read
+    directly. The value is microseconds for `cprofile` and bytes for `tracemalloc`.
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler {profiler}, choose from {', '.join(PROFILERS)}")
+    output_directory.mkdir(parents=True, exist_ok=True)
+    day_main = importlib.import_module(f"aoc2024.{day}.{day}").main
+    collapsed_path = output_directory / f"{day}.collapsed"
+
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.runcall(day_main)
+        stats_path = output_directory / f"{day}.prof"
+        profile.dump_stats(stats_path)
+        stats = pstats.Stats(profile)
+        collapsed_path.write_text("".join(f"{line}\n" for line in collapsed_call_stacks(stats)))
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        return [stats_path, collapsed_path]
+
+    tracemalloc.start(64)
+    try:
+        day_main()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    snapshot_path = output_directory / f"{day}.tracemalloc"
+    snapshot.dump(str(snapshot_path))
+    collapsed_path.write_text(
+        "".join(
+            f"{';'.join(f'{frame.filename}:{frame.lineno}' for frame in reversed(stat.traceback))} {stat.size}\n"
+            for stat in snapshot.statistics("traceback")
+        )
+    )
+    print(f"peak traced memory: {peak / 1024:.1f} KiB")
+    for stat in snapshot.statistics("lineno")[:top]:
+        print(stat)
+    return [snapshot_path, collapsed_path]
+
+
+def collapsed_call_stacks(stats: pstats.Stats) -> list[str]:
+    """
+    Rebuild collapsed stacks from cProfile's caller graph. cProfile only records caller to callee edges, so a function
+    reached along several paths has its time split between them in proportion to the time each caller spent in it,
+    the same estimate gprof2dot and flameprof make. Recursive calls are cut at the first repeat.
+    """
+    # pstats keeps its data in an untyped attribute
+    raw_stats: dict[FunctionKey, tuple[int, int, float, float, dict[FunctionKey, tuple[int, int, float, float]]]]
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+    callees: defaultdict[FunctionKey, list[tuple[FunctionKey, float]]] = defaultdict(list)
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        for caller, (_, _, _, edge_cumulative_time) in callers.items():
+            callees[caller].append((function, edge_cumulative_time))
+
+    stacks: defaultdict[str, float] = defaultdict(float)
+    # Each entry is a call path and the share of its last function's time that belongs to that path
+    pending = [([function], 1.0) for function, (*_, callers) in raw_stats.items() if not callers]
+    while pending:
+        path, share = pending.pop()
+        function = path[-1]
+        _, _, total_time, _, _ = raw_stats[function]
+        stacks[";".join(_frame_name(f) for f in path)] += total_time * share
+        for callee, edge_cumulative_time in callees[function]:
+            callee_cumulative_time = raw_stats[callee][3]
+            if callee in path or not callee_cumulative_time:
+                continue
+            callee_share = share * edge_cumulative_time / callee_cumulative_time
+            if edge_cumulative_time * share >= _MIN_STACK_TIME:
+                pending.append((path + [callee], callee_share))
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(stacks.items()) if round(seconds * 1e6)]
+
+
+def _frame_name(function: FunctionKey) -> str:
+    filename, line, name = function
+    return name if filename == "~" else f"{name} ({Path(filename).name}:{line})"
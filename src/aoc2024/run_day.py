@@ -1,48 +1,316 @@
 import argparse
 import importlib
 import os
+import sys
 import time
 from pathlib import Path
 
 import aoc2024
 
+# Everything beyond running a single day (the process pool, profilers, benchmarking) is imported where it's used so a
+# plain `aoc -d N` starts up without paying for it
 
-def main(day_number: str | None, time_execution: bool, run_all: bool) -> None:
-    os.chdir(Path(__file__).parent.parent.parent)
+
+def main(
+    day_number: str | None,
+    time_execution: bool,
+    run_all: bool,
+    jobs: int | None = None,
+    profiler: str | None = None,
+    top: int = 20,
+    import_time: bool = False,
+    remote: bool = False,
+    input_path: Path | None = None,
+    socket_path: Path | None = None,
+    memory: bool = False,
+    memory_budget: float | None = None,
+    progress: bool = False,
+    stats: bool = False,
+) -> None:
+    # A server started elsewhere resolves relative paths against its own working directory
+    input_path = input_path.absolute() if input_path is not None and input_path != Path("-") else input_path
+    if progress or stats:
+        from graph_utils import telemetry
+
+        telemetry.enable(progress, stats)
     day_list = [d for d in aoc2024.days]
-    if run_all:
-        for day in sorted(day_list):
-            run_day(day, time_execution)
+    if remote:
+        day = max(day_list) if not day_number else resolve_day(day_number, day_list)
+        run_remote(day, time_execution, input_path, socket_path)
+        return
+    memory = memory or memory_budget is not None
+    if input_path is not None and (run_all or profiler is not None or import_time or memory):
+        raise ValueError("--input only applies to running a single day, locally or with --remote")
+    if run_all and profiler is None and not import_time and not memory:
+        from aoc2024.parallel import run_days_in_parallel
+
+        run_days_in_parallel(sorted(day_list), jobs)
         return
-    if not day_number:
-        day = max(day_list)
+    if run_all:
+        days = sorted(day_list)
     else:
-        if len(day_number) == 1:
-            day_number = f"0{day_number}"
-        if f"day{day_number}" not in day_list:
-            raise ValueError(f"Day does not exist. Available days:\n  {'\n  '.join(sorted(day_list))}")
-        day = f"day{day_number}"
-    run_day(day, time_execution)
+        days = [max(day_list) if not day_number else resolve_day(day_number, day_list)]
+    failed = []
+    for day in days:
+        if memory:
+            from aoc2024.memory import format_memory_report, measure_memory
+
+            print(f"Running: {day}", flush=True)
+            report = measure_memory(day, top)
+            print(format_memory_report(report, memory_budget))
+            if report.status != "ok" or (memory_budget is not None and report.exceeds(memory_budget)):
+                failed.append(day)
+        elif import_time:
+            from aoc2024.import_time import format_import_times, measure_import_times
+
+            print(f"Import time: {day}")
+            print(format_import_times(measure_import_times(day), top))
+        elif profiler is not None:
+            from aoc2024.profiling import profile_day
+
+            print(f"Profiling: {day}")
+            for path in profile_day(day, profiler, top):
+                print(f"wrote {path}")
+        else:
+            run_day(day, time_execution, stats, input_path)
+    if failed:
+        raise SystemExit(f"failed or over the memory budget: {', '.join(failed)}")
+
 
+def resolve_day(day_number: str, day_list: list[str]) -> str:
+    if len(day_number) == 1:
+        day_number = f"0{day_number}"
+    if f"day{day_number}" not in day_list:
+        raise ValueError(f"Day does not exist. Available days:\n  {'\n  '.join(sorted(day_list))}")
+    return f"day{day_number}"
 
-def run_day(day: str, time_execution: bool) -> None:
+
+def run_day(day: str, time_execution: bool, stats: bool = False, input_path: Path | None = None) -> None:
     print(f"Running: {day}")
     day_module = importlib.import_module(f"aoc2024.{day}.{day}")
+    # Streamed rather than read up front, so days that go through their input line by line can start straight away
+    source = sys.stdin.buffer if input_path == Path("-") else input_path
     start = time.perf_counter()
-    day_module.main()
+    day_module.main(source)
     execution_time = time.perf_counter() - start
     if time_execution:
         print(f"exec time: {execution_time}")
+    if stats:
+        from graph_utils import telemetry
+
+        print(telemetry.format_stats())
+        telemetry.reset()
+
+
+def run_remote(day: str, time_execution: bool, input_path: Path | None, socket_path: Path | None) -> None:
+    from aoc2024.serve import DEFAULT_SOCKET_PATH, request_solve
+
+    input_text = sys.stdin.read() if input_path == Path("-") else None
+    outcome = request_solve(
+        day,
+        input_path if input_text is None else None,
+        input_text,
+        socket_path or DEFAULT_SOCKET_PATH,
+    )
+    print(f"Running: {day}")
+    print(outcome.output, end="")
+    if time_execution:
+        print(f"exec time: {outcome.wall_time}")
+    if outcome.status != "ok":
+        raise SystemExit(1)
+
+
+def bench(
+    day_numbers: list[str],
+    runs: int,
+    warmup: int,
+    json_path: Path | None,
+    baseline_path: Path | None,
+    threshold: float,
+    answers_path: Path | None,
+    use_cache: bool,
+) -> None:
+    from aoc2024.bench import (
+        ANSWERS_PATH,
+        bench_days,
+        compare_to_baseline,
+        format_results,
+        load_answers,
+        load_results,
+        save_results,
+    )
+    from graph_utils.cache import BYPASS_ENVIRONMENT_VARIABLE
+
+    answers_path = answers_path if answers_path is not None else ANSWERS_PATH
+    # Timed runs after the warmup would otherwise only measure loading cached parses and distance fields
+    if use_cache:
+        os.environ.pop(BYPASS_ENVIRONMENT_VARIABLE, None)
+    else:
+        os.environ[BYPASS_ENVIRONMENT_VARIABLE] = "1"
+    day_list = [d for d in aoc2024.days]
+    days = [resolve_day(day_number, day_list) for day_number in day_numbers] or sorted(day_list)
+    results = bench_days(days, runs, warmup, load_answers(answers_path))
+    if baseline_path is not None:
+        compare_to_baseline(results, load_results(baseline_path), threshold)
+    print(format_results(results))
+    if json_path is not None:
+        save_results(results, json_path)
+    if any(result.regressed or result.correct is False or result.error is not None for result in results):
+        raise SystemExit(1)
+
+
+def serve(socket_path: Path | None, workers: int | None, stop: bool) -> None:
+    from aoc2024.serve import DEFAULT_SOCKET_PATH, request_shutdown
+    from aoc2024.serve import serve as serve_days
+
+    socket_path = socket_path.absolute() if socket_path is not None else DEFAULT_SOCKET_PATH
+    if stop:
+        request_shutdown(socket_path)
+        return
+    serve_days(socket_path, workers)
+
+
+def generate(day_number: str, scale: float, seed: int, output: Path | None) -> None:
+    from aoc2024.synthetic import generate_input, solver_arguments
+
+    day = resolve_day(day_number, list(aoc2024.days))
+    text = generate_input(day, scale, seed)
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        output.write_text(text)
+    if arguments := solver_arguments(day, scale):
+        # Not part of the input, so say what to solve it with somewhere that doesn't end up in the file
+        settings = ", ".join(f"{name}={value}" for name, value in arguments.items())
+        print(f"{day} solves this input with main({settings})", file=sys.stderr)
+
+
+def scale(day_numbers: list[str], scales: list[float], seed: int, timeout: float) -> None:
+    from aoc2024.scaling import format_scaling_report, measure_scaling
+
+    day_list = [d for d in aoc2024.days]
+    days = [resolve_day(day_number, day_list) for day_number in day_numbers] or sorted(day_list)
+    for day in days:
+        print(format_scaling_report(measure_scaling(day, scales, seed, timeout)), flush=True)
 
 
 def run() -> None:
     parser = argparse.ArgumentParser(description="AOC runner")
     parser.add_argument("-d", "--day", help="day to run, defaults to latest")
     parser.add_argument("-t", "--time", help="report execution time", action="store_true")
-    parser.add_argument("-a", "--all", help="run all days", action="store_true")
+    parser.add_argument("-a", "--all", help="run all days, each in its own process", action="store_true")
+    parser.add_argument("-j", "--jobs", type=int, help="days to run at once with --all, defaults to one per CPU")
+    parser.add_argument(
+        "-p",
+        "--profile",
+        nargs="?",
+        const="cprofile",
+        choices=("cprofile", "tracemalloc"),
+        help="profile the day (or every day one at a time with --all), writing results to .cache/profiles",
+    )
+    parser.add_argument(
+        "--import-time", action="store_true", help="report how long the CLI and the day take to import, then exit"
+    )
+    parser.add_argument(
+        "-m",
+        "--memory",
+        action="store_true",
+        help="report peak RSS, peak traced memory and top allocation sites for the parse, part 1 and part 2 phases",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MIB",
+        help="measure memory as with --memory and exit with an error if any day's peak RSS goes over this many MiB",
+    )
+    parser.add_argument("--progress", action="store_true", help="show progress bars over the long loops inside days")
+    parser.add_argument(
+        "--stats", action="store_true", help="print the counters and section timers each day recorded after it runs"
+    )
+    parser.add_argument(
+        "--top", type=int, default=20, help="entries to print after profiling, --memory (per phase) or --import-time"
+    )
+    parser.add_argument("-r", "--remote", action="store_true", help="send the day to a running `aoc serve` to solve")
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=Path,
+        help="solve this input file (- for stdin) instead of the day's own, locally or with --remote",
+    )
+    parser.add_argument("--socket", type=Path, help="socket of the `aoc serve` to use with --remote")
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser("bench", help="time days over repeated runs and check their answers")
+    bench_parser.add_argument("days", nargs="*", help="days to benchmark, defaults to all")
+    bench_parser.add_argument("-n", "--runs", type=int, default=5, help="timed runs per day")
+    bench_parser.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs per day before timing")
+    bench_parser.add_argument("--json", type=Path, help="write the results to this file")
+    bench_parser.add_argument("--baseline", type=Path, help="results file from an earlier --json to compare against")
+    bench_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="fraction slower than the baseline median that fails the run"
+    )
+    bench_parser.add_argument(
+        "--answers", type=Path, help="JSON mapping each day to the lines it should print, defaults to data/answers.json"
+    )
+    bench_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="let runs hit the parsed input and distance field caches, off by default so parsing and solving are timed",
+    )
+    serve_parser = subparsers.add_parser("serve", help="keep days imported and solve requests sent with --remote")
+    serve_parser.add_argument("--socket", type=Path, help="Unix socket to listen on, defaults to .cache/aoc.sock")
+    serve_parser.add_argument("-j", "--jobs", type=int, help="worker processes, defaults to one per CPU")
+    serve_parser.add_argument("--stop", action="store_true", help="shut down the server on the socket and exit")
+    generate_parser = subparsers.add_parser("generate", help="write a seeded synthetic input for a day")
+    generate_parser.add_argument("day", help="day to generate an input for")
+    generate_parser.add_argument("-s", "--scale", type=float, default=1, help="size relative to a real input")
+    generate_parser.add_argument("--seed", type=int, default=0, help="random seed")
+    generate_parser.add_argument("-o", "--output", type=Path, help="file to write, defaults to stdout")
+    scale_parser = subparsers.add_parser("scale", help="time days over growing synthetic inputs and fit their growth")
+    scale_parser.add_argument("days", nargs="*", help="days to measure, defaults to all")
+    scale_parser.add_argument(
+        "-s", "--scales", type=float, nargs="+", default=[1, 2, 4, 8], help="input sizes relative to a real input"
+    )
+    scale_parser.add_argument("--seed", type=int, default=0, help="random seed for the generated inputs")
+    scale_parser.add_argument("--timeout", type=float, default=60, help="seconds before a run is abandoned")
     args = parser.parse_args()
 
-    main(args.day, args.time, args.all)
+    if args.command == "bench":
+        bench(
+            args.days,
+            args.runs,
+            args.warmup,
+            args.json,
+            args.baseline,
+            args.threshold,
+            args.answers,
+            args.cache,
+        )
+        return
+    if args.command == "generate":
+        generate(args.day, args.scale, args.seed, args.output)
+        return
+    if args.command == "scale":
+        scale(args.days, args.scales, args.seed, args.timeout)
+        return
+    if args.command == "serve":
+        serve(args.socket, args.jobs, args.stop)
+        return
+    main(
+        args.day,
+        args.time,
+        args.all,
+        args.jobs,
+        args.profile,
+        args.top,
+        args.import_time,
+        args.remote,
+        args.input,
+        args.socket,
+        args.memory,
+        args.memory_budget,
+        args.progress,
+        args.stats,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,102 @@
+import contextlib
+import importlib
+import math
+import multiprocessing
+import os
+import resource
+import statistics
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from pathlib import Path
+
+from aoc2024.synthetic import generate_input, solver_arguments
+
+DEFAULT_SCALES = (1.0, 2.0, 4.0, 8.0)
+
+
+@dataclass
+class ScalingPoint:
+    scale: float
+    input_bytes: int
+    status: str
+    wall_time: float
+    peak_rss_kib: int
+
+
+@dataclass
+class ScalingReport:
+    """
+    How one day's runtime grows with its input. `exponent` is the slope of log time against log input size over the
+    points that finished, so 1 is linear and 2 quadratic, or None with fewer than two of them.
+    """
+
+    day: str
+    points: list[ScalingPoint]
+    exponent: float | None
+
+
+def measure_scaling(
+    day: str, scales: Iterable[float] = DEFAULT_SCALES, seed: int = 0, timeout: float = 60
+) -> ScalingReport:
+    """
+    Run a day on generated inputs at each of `scales` in turn, each in a fresh process with every cache bypassed,
+    recording wall time and peak resident memory. A run that takes longer than `timeout` seconds is killed and the
+    larger scales are skipped since they would only take longer.
+    """
+    points = []
+    context = multiprocessing.get_context("spawn")
+    for scale in sorted(scales):
+        text = generate_input(day, scale, seed)
+        with tempfile.TemporaryDirectory() as job_directory:
+            input_file = Path(job_directory) / f"input{day.removeprefix("day")}.txt"
+            input_file.write_text(text)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run_point, args=(day, scale, input_file, sender))
+            process.start()
+            sender.close()
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join()
+                points.append(ScalingPoint(scale, len(text), "timeout", timeout, 0))
+                break
+            status, wall_time, peak_rss_kib = receiver.recv() if receiver.poll() else ("crashed", 0.0, 0)
+            points.append(ScalingPoint(scale, len(text), status, wall_time, peak_rss_kib))
+    finished = [point for point in points if point.status == "ok" and point.wall_time > 0]
+    exponent = None
+    if len({point.input_bytes for point in finished}) > 1:
+        exponent = statistics.linear_regression(
+            [math.log(point.input_bytes) for point in finished], [math.log(point.wall_time) for point in finished]
+        ).slope
+    return ScalingReport(day, points, exponent)
+
+
+def format_scaling_report(report: ScalingReport) -> str:
+    lines = [f"{report.day}", f"{'scale':>8}{'input (B)':>12}{'wall (s)':>10}{'peak RSS (MiB)':>16}  status"]
+    for point in report.points:
+        lines.append(
+            f"{point.scale:>8g}{point.input_bytes:>12}{point.wall_time:>10.3f}{point.peak_rss_kib / 1024:>16.1f}"
+            f"  {point.status}"
+        )
+    fitted = "not enough finished runs to fit" if report.exponent is None else f"time ~ input^{report.exponent:.2f}"
+    lines.append(f"{'':>8}{fitted}")
+    return "\n".join(lines)
+
+
+def _run_point(day: str, scale: float, input_file: Path, sender: Connection) -> None:
+    os.environ["AOC_NO_CACHE"] = "1"
+    status = "ok"
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+        day_main = importlib.import_module(f"aoc2024.{day}.{day}").main
+        start = time.perf_counter()
+        try:
+            day_main(input_file, **solver_arguments(day, scale))
+        except Exception:
+            status = "error"
+        wall_time = time.perf_counter() - start
+    # Linux reports this in KiB
+    sender.send((status, wall_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    sender.close()
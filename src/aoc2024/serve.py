@@ -0,0 +1,199 @@
+import importlib
+import json
+import multiprocessing
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import aoc2024
+from aoc2024.parallel import DayOutcome, run_captured
+from aoc2024.paths import CACHE_DIRECTORY
+
+DEFAULT_SOCKET_PATH = CACHE_DIRECTORY / "aoc.sock"
+# Imported by every worker up front so the first request for a day doesn't pay for them. The days only import these
+# inside the functions that use them, and graph_utils loads nothing until a name is looked up, so its searches are
+# named one by one.
+_WARM_MODULES = (
+    "joblib",
+    "tqdm",
+    "asyncio",
+    "graph_utils.astar",
+    "graph_utils.bidirectional",
+    "graph_utils.cache",
+    "graph_utils.dijkstra",
+    "graph_utils.telemetry",
+    "graph_utils.union_find",
+)
+
+
+def serve(socket_path: Path = DEFAULT_SOCKET_PATH, workers: int | None = None) -> None:
+    """
+    Keep a pool of `workers` processes with every day already imported and answer solve requests on a Unix socket
+    until interrupted or sent a shutdown request. Workers are reused between requests, so anything they start (like
+    the loky pool behind joblib in days 06 and 07) stays warm too.
+
+    The protocol is one JSON object per line each way. `{"day": "day06"}` solves the day against its usual input,
+    adding `"input_path"` (absolute) or `"input_text"` solves it against that instead. Each gets back the fields of a
+    `DayOutcome`. `{"shutdown": true}` stops the server once the requests already running have finished. A line that
+    isn't a JSON object gets an `error` outcome back, and if a worker dies its request gets a `crashed` outcome and the
+    pool is replaced for the requests after it.
+    """
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            if probe.connect_ex(str(socket_path)) == 0:
+                raise ValueError(f"a server is already listening on {socket_path}")
+        # Left behind by a server that didn't shut down cleanly
+        socket_path.unlink()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    pool = _WorkerPool(workers or os.cpu_count() or 1)
+    try:
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        request = None
+                    if not isinstance(request, dict):
+                        response = asdict(
+                            DayOutcome("", "error", 0.0, 0.0, "requests must be one JSON object a line\n")
+                        )
+                        self.wfile.write(json.dumps(response).encode() + b"\n")
+                        self.wfile.flush()
+                        continue
+                    if request.get("shutdown"):
+                        self.wfile.write(b'{"status": "shutting down"}\n')
+                        self.server.shutdown()
+                        return
+                    response = _handle_solve(pool, request)
+                    self.wfile.write(json.dumps(response).encode() + b"\n")
+                    self.wfile.flush()
+
+        with socketserver.ThreadingUnixStreamServer(str(socket_path), RequestHandler) as server:
+            pool.warm()
+            print(f"listening on {socket_path}", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                socket_path.unlink(missing_ok=True)
+    finally:
+        pool.shutdown()
+
+
+def request_solve(
+    day: str,
+    input_path: Path | None = None,
+    input_text: str | None = None,
+    socket_path: Path = DEFAULT_SOCKET_PATH,
+) -> DayOutcome:
+    request: dict[str, Any] = {"day": day}
+    if input_path is not None:
+        request["input_path"] = str(input_path.absolute())
+    if input_text is not None:
+        request["input_text"] = input_text
+    return DayOutcome(**_send(request, socket_path))
+
+
+def request_shutdown(socket_path: Path = DEFAULT_SOCKET_PATH) -> None:
+    _send({"shutdown": True}, socket_path)
+
+
+def _send(request: dict[str, Any], socket_path: Path) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise ValueError(f"no server listening on {socket_path}, start one with `aoc serve`") from e
+        with connection.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            line = stream.readline()
+    if not line:
+        raise ValueError(f"the server on {socket_path} closed the connection without replying")
+    response: dict[str, Any] = json.loads(line)
+    return response
+
+
+class _WorkerPool:
+    """
+    A pool of warmed worker processes that is replaced with a fresh one when a worker dies, since a
+    `ProcessPoolExecutor` refuses all further work once that happens
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._pool = self._start()
+
+    def warm(self) -> None:
+        """
+        Start and warm every worker before the first request rather than during it
+        """
+        with self._lock:
+            pool = self._pool
+        for _ in pool.map(_ping, range(self.workers)):
+            pass
+
+    def solve(self, day: str, input_path: str | None, input_text: str | None) -> DayOutcome:
+        with self._lock:
+            pool = self._pool
+        try:
+            return pool.submit(_solve, day, input_path, input_text).result()
+        except BrokenProcessPool:
+            with self._lock:
+                # Only the first request to notice replaces it, the rest were running on the same broken pool
+                if self._pool is pool:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = self._start()
+            return DayOutcome(day, "crashed", 0.0, 0.0, "worker process died\n")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._pool.shutdown()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked, the pool starts workers on demand after the server threads exist
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_warm_worker
+        )
+
+
+def _handle_solve(pool: _WorkerPool, request: dict[str, Any]) -> dict[str, Any]:
+    day = request.get("day")
+    if day not in aoc2024.days:
+        return asdict(DayOutcome(str(day), "error", 0.0, 0.0, f"unknown day {day}\n"))
+    input_path = request.get("input_path")
+    input_text = request.get("input_text")
+    if not isinstance(input_path, str | None) or not isinstance(input_text, str | None):
+        return asdict(DayOutcome(str(day), "error", 0.0, 0.0, "input_path and input_text must be strings\n"))
+    return asdict(pool.solve(str(day), input_path, input_text))
+
+
+def _warm_worker() -> None:
+    for module in _WARM_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    for day in aoc2024.days:
+        importlib.import_module(f"aoc2024.{day}.{day}")
+
+
+def _ping(_: int) -> int:
+    return os.getpid()
+
+
+def _solve(day: str, input_path: str | None, input_text: str | None) -> DayOutcome:
+    if input_text is not None:
+        return run_captured(day, input_text.encode())
+    return run_captured(day, None if input_path is None else Path(input_path))
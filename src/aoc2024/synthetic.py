@@ -0,0 +1,330 @@
+import math
+import random
+import string
+from collections.abc import Callable
+
+type Generator = Callable[[random.Random, float], str]
+
+
+def generate_input(day: str, scale: float = 1, seed: int = 0) -> str:
+    """
+    Puzzle input for `day` roughly `scale` times the size of a real one, the same for the same `seed`. Grids grow by
+    `sqrt(scale)` a side so their area scales, everything else grows its line or record count. Inputs are built so the
+    solvers finish: guards walk off the map, day 14's robots line up on a midline, mazes have a route and so on. Day
+    18's memory space grows like any other grid, so solving it takes the sizes from `solver_arguments`.
+    """
+    if day not in GENERATORS:
+        raise ValueError(f"No generator for {day}. Available days:\n  {'\n  '.join(sorted(GENERATORS))}")
+    if scale <= 0:
+        raise ValueError("scale must be positive")
+    return GENERATORS[day](random.Random(seed), scale)
+
+
+def solver_arguments(day: str, scale: float) -> dict[str, int]:
+    """
+    Keyword arguments for `day`'s `main` to solve an input generated at `scale`, for days whose puzzle text gives sizes
+    the input doesn't hold
+    """
+    if day == "day18":
+        side = _day18_side(scale)
+        return {"max_coordinate": side - 1, "n_bytes": round(1024 * side * side / 71**2)}
+    return {}
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+
+def _side(base: int, scale: float, odd: bool = False) -> int:
+    side = max(5, round(base * math.sqrt(scale)))
+    return side | 1 if odd else side
+
+
+def _lines(rows: list[str]) -> str:
+    return "\n".join(rows) + "\n"
+
+
+def _day01(rng: random.Random, scale: float) -> str:
+    return _lines(
+        [f"{rng.randrange(10000, 100000)}   {rng.randrange(10000, 100000)}" for _ in range(_count(1000, scale))]
+    )
+
+
+def _day02(rng: random.Random, scale: float) -> str:
+    reports = []
+    for _ in range(_count(1000, scale)):
+        sign = rng.choice((-1, 1))
+        levels = [rng.randrange(10, 90)]
+        for _ in range(rng.randrange(4, 8)):
+            levels.append(levels[-1] + sign * rng.randrange(1, 4))
+        # Break about half of them, some badly enough that removing one level doesn't help
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            levels[rng.randrange(len(levels))] += rng.choice((-5, -1, 0, 1, 5))
+        reports.append(" ".join(map(str, levels)))
+    return _lines(reports)
+
+
+def _day03(rng: random.Random, scale: float) -> str:
+    noise = string.ascii_letters + string.digits + "()[]{}<>,;:'!@#$%^&*-+ "
+    fragments = []
+    for _ in range(_count(6 * 700, scale)):
+        roll = rng.random()
+        if roll < 0.55:
+            fragments.append(f"mul({rng.randrange(1, 1000)},{rng.randrange(1, 1000)})")
+        elif roll < 0.65:
+            fragments.append(rng.choice(("do()", "don't()")))
+        elif roll < 0.75:
+            # Near misses the pattern has to reject
+            fragments.append(rng.choice(("mul(4*", "mul ( 2 , 4 )", "mul(1000,2)", "do_not_mul(5,5", "mul[3,7]")))
+        fragments.append("".join(rng.choices(noise, k=rng.randrange(0, 8))))
+    text = "".join(fragments)
+    return _lines([text[i : i + 3000] for i in range(0, len(text), 3000)])
+
+
+def _day04(rng: random.Random, scale: float) -> str:
+    side = _side(140, scale)
+    return _lines(["".join(rng.choices("XMAS", k=side)) for _ in range(side)])
+
+
+def _day05(rng: random.Random, scale: float) -> str:
+    pages = rng.sample(range(10, 100), 49)
+    rules = [f"{a}|{b}" for i, a in enumerate(pages) for b in pages[i + 1 :]]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(_count(200, scale)):
+        update = rng.sample(pages, rng.randrange(2, 12) * 2 + 1)
+        # Leave about half in rule order
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+    return "\n".join(rules) + "\n\n" + _lines(updates)
+
+
+def _day06(rng: random.Random, scale: float) -> str:
+    side = _side(130, scale)
+    while True:
+        grid = [["#" if rng.random() < 0.012 else "." for _ in range(side)] for _ in range(side)]
+        start = (rng.randrange(side // 4, 3 * side // 4), rng.randrange(side // 4, 3 * side // 4))
+        grid[start[0]][start[1]] = "^"
+        # Part one only ends when the guard walks off the map, so reroll any grid that traps it in a loop
+        if _guard_exits(grid, start):
+            return _lines(["".join(row) for row in grid])
+
+
+def _guard_exits(grid: list[list[str]], start: tuple[int, int]) -> bool:
+    side = len(grid)
+    (row, col), (d_row, d_col) = start, (-1, 0)
+    seen = set()
+    while (state := (row, col, d_row, d_col)) not in seen:
+        seen.add(state)
+        next_row, next_col = row + d_row, col + d_col
+        if not (0 <= next_row < side and 0 <= next_col < side):
+            return True
+        if grid[next_row][next_col] == "#":
+            d_row, d_col = d_col, -d_row
+        else:
+            row, col = next_row, next_col
+    return False
+
+
+def _day07(rng: random.Random, scale: float) -> str:
+    equations = []
+    for _ in range(_count(850, scale)):
+        values = [rng.randrange(1, 100) for _ in range(rng.randrange(3, 10))]
+        total = values[0]
+        for value in values[1:]:
+            total = rng.choice((total + value, total * value, int(f"{total}{value}")))
+        # Some can't be made with any operators
+        if rng.random() < 0.4:
+            total += rng.randrange(1, 100)
+        equations.append(f"{total}: {' '.join(map(str, values))}")
+    return _lines(equations)
+
+
+def _day08(rng: random.Random, scale: float) -> str:
+    side = _side(50, scale)
+    grid = [["."] * side for _ in range(side)]
+    frequencies = string.ascii_letters + string.digits
+    for _ in range(_count(200, scale)):
+        grid[rng.randrange(side)][rng.randrange(side)] = rng.choice(frequencies)
+    return _lines(["".join(row) for row in grid])
+
+
+def _day09(rng: random.Random, scale: float) -> str:
+    files = _count(10000, scale)
+    digits = []
+    for i in range(files):
+        digits.append(str(rng.randrange(1, 10)))
+        if i < files - 1:
+            digits.append(str(rng.randrange(0, 10)))
+    return _lines(["".join(digits)])
+
+
+def _day10(rng: random.Random, scale: float) -> str:
+    side = _side(45, scale)
+    # Diagonal ramps give plenty of trails, the noise breaks some of them up
+    return _lines(
+        [
+            "".join(str((row + col) % 10 if rng.random() > 0.2 else rng.randrange(10)) for col in range(side))
+            for row in range(side)
+        ]
+    )
+
+
+def _day11(rng: random.Random, scale: float) -> str:
+    return _lines([" ".join(str(rng.randrange(0, 10_000_000)) for _ in range(_count(8, scale)))])
+
+
+def _day13(rng: random.Random, scale: float) -> str:
+    machines = []
+    for _ in range(_count(320, scale)):
+        while True:
+            a = (rng.randrange(10, 100), rng.randrange(10, 100))
+            b = (rng.randrange(10, 100), rng.randrange(10, 100))
+            # Collinear buttons have no unique solution and the solver divides by this
+            if a[0] * b[1] != a[1] * b[0]:
+                break
+        presses = (rng.randrange(1, 101), rng.randrange(1, 101))
+        prize = (presses[0] * a[0] + presses[1] * b[0], presses[0] * a[1] + presses[1] * b[1])
+        if rng.random() < 0.5:
+            prize = (prize[0] + rng.randrange(1, 50), prize[1] + rng.randrange(1, 50))
+        machines.append(
+            f"Button A: X+{a[0]}, Y+{a[1]}\nButton B: X+{b[0]}, Y+{b[1]}\nPrize: X={prize[0]}, Y={prize[1]}"
+        )
+    return "\n\n".join(machines) + "\n"
+
+
+def _day14(rng: random.Random, scale: float) -> str:
+    # The puzzle fixes the room size, part two runs until the safety factor drops so every robot is placed to be on
+    # the middle column (which counts towards no quadrant) at the same second
+    width, height = 101, 103
+    lineup = rng.randrange(100, 2000)
+    robots = []
+    for _ in range(_count(500, scale)):
+        velocity = (rng.randrange(-99, 100), rng.randrange(-99, 100))
+        end = (width // 2, rng.randrange(height))
+        start = ((end[0] - velocity[0] * lineup) % width, (end[1] - velocity[1] * lineup) % height)
+        robots.append(f"p={start[0]},{start[1]} v={velocity[0]},{velocity[1]}")
+    return _lines(robots)
+
+
+def _maze(rng: random.Random, side: int, extra_openings: int) -> list[list[str]]:
+    """
+    Depth first maze on an odd `side` grid with a wall border, plus some knocked out walls to make loops
+    """
+    grid = [["#"] * side for _ in range(side)]
+    stack = [(side - 2, 1)]
+    grid[side - 2][1] = "."
+    while stack:
+        row, col = stack[-1]
+        options = [
+            (d_row, d_col)
+            for d_row, d_col in ((2, 0), (-2, 0), (0, 2), (0, -2))
+            if 0 < row + d_row < side - 1 and 0 < col + d_col < side - 1 and grid[row + d_row][col + d_col] == "#"
+        ]
+        if not options:
+            stack.pop()
+            continue
+        d_row, d_col = rng.choice(options)
+        grid[row + d_row // 2][col + d_col // 2] = "."
+        grid[row + d_row][col + d_col] = "."
+        stack.append((row + d_row, col + d_col))
+    for _ in range(extra_openings):
+        grid[rng.randrange(1, side - 1)][rng.randrange(1, side - 1)] = "."
+    return grid
+
+
+def _day16(rng: random.Random, scale: float) -> str:
+    side = _side(141, scale, odd=True)
+    grid = _maze(rng, side, side * side // 8)
+    grid[side - 2][1] = "S"
+    grid[1][side - 2] = "E"
+    return _lines(["".join(row) for row in grid])
+
+
+def _day17(rng: random.Random, scale: float) -> str:
+    # A real style program, one output per octal digit of register A
+    program = "2,4,1,5,7,5,1,6,4,3,5,5,0,3,3,0"
+    register_a = rng.randrange(8 ** (_count(16, scale) - 1), 8 ** _count(16, scale))
+    return f"Register A: {register_a}\nRegister B: 0\nRegister C: 0\n\nProgram: {program}\n"
+
+
+def _day18(rng: random.Random, scale: float) -> str:
+    # A 71x71 grid at scale 1 like the puzzle, with about the same share of it falling. Maze walls fall first, so the
+    # first 1024 (scaled with the area) leave a route. The two cells next to the exit fall last, which cuts the route if
+    # nothing before did.
+    inner = _day18_side(scale)
+    grid = _maze(rng, inner + 2, 0)
+    last_fallen = [(inner - 2, inner - 1), (inner - 1, inner - 2)]
+    walls: list[tuple[int, int]] = []
+    opens: list[tuple[int, int]] = []
+    for y in range(1, inner + 1):
+        for x in range(1, inner + 1):
+            if (x, y) in ((1, 1), (inner, inner)) or (x - 1, y - 1) in last_fallen:
+                continue
+            (walls if grid[y][x] == "#" else opens).append((x - 1, y - 1))
+    rng.shuffle(walls)
+    rng.shuffle(opens)
+    fallen = max(len(walls), round(inner * inner * 0.68) - len(last_fallen))
+    cells = (walls + opens)[:fallen] + last_fallen
+    return _lines([f"{x},{y}" for x, y in cells])
+
+
+def _day18_side(scale: float) -> int:
+    return _side(71, scale, odd=True)
+
+
+def _day19(rng: random.Random, scale: float) -> str:
+    colours = "wubrg"
+    towels = sorted({"".join(rng.choices(colours, k=rng.randrange(1, 9))) for _ in range(450)})
+    designs = []
+    for _ in range(_count(400, scale)):
+        if rng.random() < 0.7:
+            design = ""
+            length = rng.randrange(20, 60)
+            while len(design) < length:
+                design += rng.choice(towels)
+        else:
+            design = "".join(rng.choices(colours, k=rng.randrange(20, 60)))
+        designs.append(design)
+    return ", ".join(towels) + "\n\n" + _lines(designs)
+
+
+def _day20(rng: random.Random, scale: float) -> str:
+    # One winding track, back and forth along every other row. The rng only picks which way it starts.
+    side = _side(141, scale, odd=True)
+    grid = [["#"] * side for _ in range(side)]
+    track: list[tuple[int, int]] = []
+    flip = rng.random() < 0.5
+    for i, row in enumerate(range(1, side - 1, 2)):
+        columns = range(1, side - 1) if (i % 2 == 0) != flip else range(side - 2, 0, -1)
+        track.extend((row, col) for col in columns)
+        if row + 2 < side - 1:
+            track.append((row + 1, columns[-1]))
+    for row, col in track:
+        grid[row][col] = "."
+    grid[track[0][0]][track[0][1]] = "S"
+    grid[track[-1][0]][track[-1][1]] = "E"
+    return _lines(["".join(row) for row in grid])
+
+
+GENERATORS: dict[str, Generator] = {
+    "day01": _day01,
+    "day02": _day02,
+    "day03": _day03,
+    "day04": _day04,
+    "day05": _day05,
+    "day06": _day06,
+    "day07": _day07,
+    "day08": _day08,
+    "day09": _day09,
+    "day10": _day10,
+    "day11": _day11,
+    "day13": _day13,
+    "day14": _day14,
+    "day16": _day16,
+    "day17": _day17,
+    "day18": _day18,
+    "day19": _day19,
+    "day20": _day20,
+}
@@ -1,3 +1,80 @@
-from .dijkstra import dijkstra, get_neighbours, sort_distance_dict
+import importlib
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["dijkstra", "sort_distance_dict", "get_neighbours"]
+# Submodules are only imported when one of their names is first used, so reaching for `graph_utils.telemetry` (a
+# switch that is usually off) doesn't load the caches and searches as well
+_SUBMODULE_BY_NAME = {
+    "a_star": "astar",
+    "manhattan_heuristic": "astar",
+    "oriented_manhattan_heuristic": "astar",
+    "batch_shortest_paths": "batch",
+    "breadth_first": "bfs",
+    "BidirectionalResult": "bidirectional",
+    "bidirectional_dijkstra": "bidirectional",
+    "DistanceFieldCache": "cache",
+    "distance_field_key": "cache",
+    "dijkstra": "dijkstra",
+    "get_neighbours": "dijkstra",
+    "shortest_paths": "dijkstra",
+    "sort_distance_dict": "dijkstra",
+    "GridGraph": "grid",
+    "canonical_path": "path_dag",
+    "count_optimal_paths": "path_dag",
+    "optimal_path_nodes": "path_dag",
+    "predecessor_order": "path_dag",
+    "DisjointSet": "union_find",
+    "first_blocking_index": "union_find",
+}
+
+if TYPE_CHECKING:
+    from . import telemetry
+    from .astar import a_star, manhattan_heuristic, oriented_manhattan_heuristic
+    from .batch import batch_shortest_paths
+    from .bfs import breadth_first
+    from .bidirectional import BidirectionalResult, bidirectional_dijkstra
+    from .cache import DistanceFieldCache, distance_field_key
+    from .dijkstra import dijkstra, get_neighbours, shortest_paths, sort_distance_dict
+    from .grid import GridGraph
+    from .path_dag import (
+        canonical_path,
+        count_optimal_paths,
+        optimal_path_nodes,
+        predecessor_order,
+    )
+    from .union_find import DisjointSet, first_blocking_index
+
+
+def __getattr__(name: str) -> Any:
+    if name == "telemetry":
+        return importlib.import_module(f"{__name__}.telemetry")
+    if name not in _SUBMODULE_BY_NAME:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_SUBMODULE_BY_NAME[name]}"), name)
+    # Cached on the package so later lookups don't come back through here
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "dijkstra",
+    "shortest_paths",
+    "breadth_first",
+    "batch_shortest_paths",
+    "a_star",
+    "bidirectional_dijkstra",
+    "BidirectionalResult",
+    "manhattan_heuristic",
+    "oriented_manhattan_heuristic",
+    "sort_distance_dict",
+    "get_neighbours",
+    "GridGraph",
+    "optimal_path_nodes",
+    "count_optimal_paths",
+    "canonical_path",
+    "predecessor_order",
+    "DisjointSet",
+    "first_blocking_index",
+    "DistanceFieldCache",
+    "distance_field_key",
+    "telemetry",
+]
@@ -0,0 +1,203 @@
+import heapq
+import itertools
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from typing import cast, overload
+
+from . import telemetry
+from .dijkstra import EdgeGetter
+from .grid import GridGraph
+
+type Coord = tuple[int, int]
+type OrientedNode = tuple[int, int, str]
+type Heuristic[NodeType] = Callable[[NodeType], float]
+
+# Orientation characters used by day 16 mazes mapped to their (row, col) step
+ORIENTATION_STEPS = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
+
+
+@overload
+def a_star(
+    sources: Iterable[Coord],
+    graph: GridGraph,
+    targets: Iterable[Coord],
+    heuristic: Heuristic[Coord] | None = None,
+    all_ties: bool = False,
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]: ...
+
+
+@overload
+def a_star[
+    NodeType
+](
+    sources: Iterable[NodeType],
+    graph: EdgeGetter[NodeType],
+    targets: Iterable[NodeType],
+    heuristic: Heuristic[NodeType],
+    all_ties: bool = False,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]: ...
+
+
+def a_star[
+    NodeType
+](
+    sources: Iterable[NodeType] | Iterable[Coord],
+    graph: EdgeGetter[NodeType] | GridGraph,
+    targets: Iterable[NodeType] | Iterable[Coord],
+    heuristic: Heuristic[NodeType] | Heuristic[Coord] | None = None,
+    all_ties: bool = False,
+) -> (
+    tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]
+    | tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]
+):
+    """
+    A* search from `sources` that stops as soon as the first of `targets` is settled. `heuristic` estimates the
+    remaining distance to the nearest target and must be consistent (never drop by more than the edge just taken),
+    which holds for `manhattan_heuristic` and `oriented_manhattan_heuristic`. For a `GridGraph` it defaults to
+    Manhattan distance to the targets.
+
+    Returns the settled distances, in settle order rather than by distance, and the previous mapping of the settled
+    nodes. By default ties on estimated total go to the node furthest along, which heads straight for the goal on open
+    grids but means a node can settle before some of its equal cost predecessors. With `all_ties` the smaller distance
+    wins instead, so every equal cost predecessor settles first and the previous sets are as complete as
+    `shortest_paths` gives (at the cost of settling every node on any optimal path).
+    """
+    # Second heap key, negated distance so far prefers deeper nodes
+    tie_sign = 1 if all_ties else -1
+    if isinstance(graph, GridGraph):
+        grid_targets = list(cast(Iterable[Coord], targets))
+        grid_heuristic = cast(Heuristic[Coord] | None, heuristic) or manhattan_heuristic(*grid_targets)
+        return _grid_a_star(graph, cast(Iterable[Coord], sources), grid_targets, grid_heuristic, tie_sign)
+    if heuristic is None:
+        raise ValueError("a heuristic is required unless searching a GridGraph")
+    node_heuristic = cast(Heuristic[NodeType], heuristic)
+    edge_getter = graph
+    target_set = set(cast(Iterable[NodeType], targets))
+    settled: dict[NodeType, float] = {}
+    tentative: dict[NodeType, float] = {}
+    previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
+    tie_breaker = itertools.count()
+    heap: list[tuple[float, float, int, NodeType]] = []
+    for node in cast(Iterable[NodeType], sources):
+        tentative[node] = 0
+        heap.append((node_heuristic(node), 0, next(tie_breaker), node))
+    heapq.heapify(heap)
+    source_count = len(heap)
+
+    while heap:
+        _, _, _, current_node = heapq.heappop(heap)
+        if current_node in settled:
+            continue
+        current_distance = tentative[current_node]
+        settled[current_node] = current_distance
+        if current_node in target_set:
+            break
+        for node, weight in edge_getter(current_node):
+            if node in settled:
+                continue
+            alt_distance = current_distance + weight
+            best_distance = tentative.get(node)
+            if best_distance is None or alt_distance < best_distance:
+                tentative[node] = alt_distance
+                previous[node] = {current_node}
+                heapq.heappush(
+                    heap, (alt_distance + node_heuristic(node), tie_sign * alt_distance, next(tie_breaker), node)
+                )
+            elif alt_distance == best_distance:
+                previous[node].add(current_node)
+
+    pushes = next(tie_breaker)
+    telemetry.count("a_star.pops", pushes - len(heap))
+    telemetry.count("a_star.relaxations", pushes - source_count)
+    telemetry.count("a_star.settled", len(settled))
+    return settled, defaultdict(set, {node: prev for node, prev in previous.items() if node in settled})
+
+
+def _grid_a_star(
+    graph: GridGraph, sources: Iterable[Coord], targets: list[Coord], heuristic: Heuristic[Coord], tie_sign: int
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]:
+    """
+    `a_star` on the flat indices of a `GridGraph`. The heuristic is only evaluated when a cell's distance improves, not
+    once per edge.
+    """
+    walls = graph.walls
+    offsets = graph.offsets
+    coord = graph.coord
+    target_indices = {graph.index(t) for t in targets}
+    tentative: dict[int, float] = {}
+    is_settled = bytearray(graph.size)
+    settled: dict[int, float] = {}
+    previous: dict[int, list[int]] = {}
+    heap: list[tuple[float, float, int]] = []
+    for source in sources:
+        index = graph.open_index(source)
+        tentative[index] = 0
+        heap.append((heuristic(source), 0, index))
+    heapq.heapify(heap)
+
+    while heap:
+        _, _, current_index = heapq.heappop(heap)
+        if is_settled[current_index]:
+            continue
+        current_distance = tentative[current_index]
+        is_settled[current_index] = 1
+        settled[current_index] = current_distance
+        if current_index in target_indices:
+            break
+        alt_distance = current_distance + 1
+        for offset in offsets:
+            index = current_index + offset
+            if walls[index] or is_settled[index]:
+                continue
+            best_distance = tentative.get(index)
+            if best_distance is None or alt_distance < best_distance:
+                tentative[index] = alt_distance
+                previous[index] = [current_index]
+                heapq.heappush(heap, (alt_distance + heuristic(coord(index)), tie_sign * alt_distance, index))
+            elif alt_distance == best_distance:
+                previous[index].append(current_index)
+
+    telemetry.count("a_star.settled", len(settled))
+    return graph.coord_result(settled, previous)
+
+
+def manhattan_heuristic(*goals: Coord) -> Heuristic[Coord]:
+    """
+    Manhattan distance to the nearest of `goals`, admissible and consistent for unit weight 4-neighbour grids
+    """
+    if len(goals) == 1:
+        goal_row, goal_col = goals[0]
+        return lambda coord: abs(coord[0] - goal_row) + abs(coord[1] - goal_col)
+    return lambda coord: min(abs(coord[0] - row) + abs(coord[1] - col) for row, col in goals)
+
+
+def oriented_manhattan_heuristic(goal: Coord, step_cost: float = 1, turn_cost: float = 1000) -> Heuristic[OrientedNode]:
+    """
+    Heuristic for `(row, col, orientation)` maze nodes where stepping forward costs `step_cost` and a 90 degree turn
+    costs `turn_cost`. On top of the Manhattan distance to the `goal` tile it adds the fewest turns any route needs:
+    one per extra direction still to travel in when facing a needed direction, one when side on to the only direction
+    needed and two when facing away from it.
+    """
+    goal_row, goal_col = goal
+
+    def estimate(node: OrientedNode) -> float:
+        row, col, orientation = node
+        row_gap = goal_row - row
+        col_gap = goal_col - col
+        step_row, step_col = ORIENTATION_STEPS[orientation]
+        needed = [step for step in ((_sign(row_gap), 0), (0, _sign(col_gap))) if step != (0, 0)]
+        if not needed:
+            turns = 0
+        elif (step_row, step_col) in needed:
+            turns = len(needed) - 1
+        elif len(needed) == 1 and (step_row, step_col) != (-needed[0][0], -needed[0][1]):
+            turns = 1
+        else:
+            turns = 2
+        return (abs(row_gap) + abs(col_gap)) * step_cost + turns * turn_cost
+
+    return estimate
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
@@ -0,0 +1,113 @@
+import math
+import os
+from array import array
+from collections.abc import Iterable, Sequence
+
+from .grid import GridGraph
+
+type Coord = tuple[int, int]
+type GridQuery = tuple[Iterable[Coord], Iterable[Coord] | None]
+# A query after validation, as flat indices
+type _IndexQuery = tuple[list[int], list[int] | None]
+
+# Grid rebuilt from shared memory once per worker process by `_attach_grid`
+_worker_graph: GridGraph | None = None
+
+
+def batch_shortest_paths(
+    graph: GridGraph,
+    queries: Iterable[GridQuery],
+    workers: int | None = None,
+    chunk_size: int = 8,
+) -> list[array[float]]:
+    """
+    Answer many `(sources, targets)` queries against the same grid, fanned out over `workers` processes (default one
+    per CPU, 1 runs them here without a pool) `chunk_size` queries at a time.
+
+    The wall bitmap goes into shared memory once and each worker picks it up when it starts, so only the queries and
+    results cross between processes. Each result is a flat `array("d")` with an entry per cell of the padded grid,
+    read with `result[graph.index(coord)]`, holding the distance from the nearest source or `math.inf` if the cell was
+    not reached. With targets a query stops after the frontier that reaches all of them, so cells further out than the
+    furthest target stay at `math.inf`. Sources and targets are checked against the grid up front.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    index_queries = [
+        ([graph.open_index(s) for s in sources], [graph.index(t) for t in targets] if targets is not None else None)
+        for sources, targets in queries
+    ]
+    worker_count = workers or os.cpu_count() or 1
+    if worker_count == 1 or len(index_queries) <= chunk_size:
+        return [_distance_field(graph, sources, targets) for sources, targets in index_queries]
+
+    # Only paid for when a pool is actually used, most callers of graph_utils never need these
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+
+    chunks = [index_queries[i : i + chunk_size] for i in range(0, len(index_queries), chunk_size)]
+    shared_walls = SharedMemory(create=True, size=graph.size)
+    try:
+        shared_walls.buf[: graph.size] = graph.walls
+        with ProcessPoolExecutor(
+            max_workers=min(worker_count, len(chunks)),
+            initializer=_attach_grid,
+            initargs=(shared_walls.name, graph.max_row, graph.max_col),
+        ) as pool:
+            results = []
+            for chunk_result in pool.map(_solve_chunk, chunks):
+                for raw in chunk_result:
+                    field = array("d")
+                    field.frombytes(raw)
+                    results.append(field)
+    finally:
+        shared_walls.close()
+        shared_walls.unlink()
+    return results
+
+
+def _attach_grid(shared_name: str, max_row: int, max_col: int) -> None:
+    from multiprocessing.shared_memory import SharedMemory
+
+    global _worker_graph
+    shared_walls = SharedMemory(name=shared_name, track=False)
+    try:
+        graph = GridGraph(max_row, max_col)
+        graph.walls[:] = shared_walls.buf[: graph.size]
+    finally:
+        shared_walls.close()
+    _worker_graph = graph
+
+
+def _solve_chunk(chunk: Sequence[_IndexQuery]) -> list[bytes]:
+    if _worker_graph is None:
+        raise ValueError("worker was started without a grid")
+    graph = _worker_graph
+    return [_distance_field(graph, sources, targets).tobytes() for sources, targets in chunk]
+
+
+def _distance_field(graph: GridGraph, sources: list[int], targets: list[int] | None) -> array[float]:
+    """
+    Frontier at a time breadth first search over flat indices, writing distances straight into the result array
+    """
+    walls = graph.walls
+    offsets = graph.offsets
+    distances = array("d", [math.inf]) * graph.size
+    for index in sources:
+        distances[index] = 0
+    remaining_targets = {t for t in targets if distances[t] != 0} if targets is not None else None
+    frontier = sources
+    depth = 0
+
+    while frontier and remaining_targets != set():
+        depth += 1
+        next_frontier = []
+        for current_index in frontier:
+            for offset in offsets:
+                index = current_index + offset
+                if not walls[index] and distances[index] == math.inf:
+                    distances[index] = depth
+                    next_frontier.append(index)
+        if remaining_targets is not None:
+            remaining_targets.difference_update(next_frontier)
+        frontier = next_frontier
+    return distances
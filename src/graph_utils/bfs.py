@@ -0,0 +1,152 @@
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from typing import cast, overload
+
+from . import telemetry
+from .grid import GridGraph
+
+type Coord = tuple[int, int]
+type NeighbourGetter[NodeType] = Callable[[NodeType], Iterable[NodeType]]
+type Sources[NodeType] = Iterable[NodeType] | Mapping[NodeType, float]
+
+
+@overload
+def breadth_first(
+    sources: Sources[Coord],
+    graph: GridGraph,
+    targets: Iterable[Coord] | None = None,
+    stop_at_first_target: bool = False,
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]: ...
+
+
+@overload
+def breadth_first[
+    NodeType
+](
+    sources: Sources[NodeType],
+    graph: NeighbourGetter[NodeType],
+    targets: Iterable[NodeType] | None = None,
+    stop_at_first_target: bool = False,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]: ...
+
+
+def breadth_first[
+    NodeType
+](
+    sources: Sources[NodeType] | Sources[Coord],
+    graph: NeighbourGetter[NodeType] | GridGraph,
+    targets: Iterable[NodeType] | Iterable[Coord] | None = None,
+    stop_at_first_target: bool = False,
+) -> (
+    tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]
+    | tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]
+):
+    """
+    Shortest paths for graphs where every edge has weight 1. `graph` is either a `GridGraph` or a neighbour getter
+    mapping a node to the nodes next to it. Every node in `sources` is seeded at once (at 0, or at their shared value if
+    given as a mapping) so this doubles as a multi-source search.
+
+    Works one frontier at a time, so a node's distance is final as soon as it is discovered and its previous set is
+    complete once its frontier is finished. With `targets` the search stops after the frontier that settles all of them
+    (or the first one with `stop_at_first_target`). Returns the same ascending distances and tie-aware previous mapping
+    as `shortest_paths`.
+    """
+    start_distance = _start_distance(sources)
+    if isinstance(graph, GridGraph):
+        return _grid_breadth_first(
+            graph,
+            cast(Iterable[Coord], sources),
+            start_distance,
+            cast(Iterable[Coord] | None, targets),
+            stop_at_first_target,
+        )
+    neighbour_getter = graph
+    distances: dict[NodeType, float] = {node: start_distance for node in cast(Iterable[NodeType], sources)}
+    previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
+    remaining_targets = set(cast(Iterable[NodeType], targets)) if targets is not None else None
+    frontier = list(distances)
+    depth = start_distance
+
+    while frontier and not _frontier_hits_targets(frontier, remaining_targets, stop_at_first_target):
+        depth += 1
+        next_frontier = []
+        for current_node in frontier:
+            for node in neighbour_getter(current_node):
+                node_distance = distances.get(node)
+                if node_distance is None:
+                    distances[node] = depth
+                    previous[node] = {current_node}
+                    next_frontier.append(node)
+                elif node_distance == depth:
+                    previous[node].add(current_node)
+        frontier = next_frontier
+    telemetry.count("bfs.visited", len(distances))
+    return distances, previous
+
+
+def _start_distance[NodeType](sources: Sources[NodeType]) -> float:
+    if not isinstance(sources, Mapping):
+        return 0
+    start_distances = set(sources.values())
+    if len(start_distances) > 1:
+        raise ValueError("breadth first sources must all start at the same distance, use shortest_paths instead")
+    return start_distances.pop() if start_distances else 0
+
+
+def _frontier_hits_targets[
+    NodeType
+](frontier: list[NodeType], remaining_targets: set[NodeType] | None, stop_at_first_target: bool) -> bool:
+    """
+    Strike off any targets in a finished frontier and report whether the search can stop
+    """
+    if remaining_targets is None:
+        return False
+    hits = remaining_targets.intersection(frontier)
+    if stop_at_first_target and hits:
+        return True
+    remaining_targets -= hits
+    return not remaining_targets
+
+
+def _grid_breadth_first(
+    graph: GridGraph,
+    sources: Iterable[Coord],
+    start_distance: float,
+    targets: Iterable[Coord] | None,
+    stop_at_first_target: bool,
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]:
+    """
+    `breadth_first` on the flat indices of a `GridGraph`. `seen` is a bytearray alongside the wall bitmap so the
+    inner loop never builds a tuple or hashes a coordinate.
+    """
+    walls = graph.walls
+    offsets = graph.offsets
+    seen = bytearray(graph.size)
+    settled: dict[int, float] = {}
+    previous: dict[int, list[int]] = {}
+    for coord in sources:
+        index = graph.open_index(coord)
+        seen[index] = 1
+        settled[index] = start_distance
+    remaining_targets = {graph.index(t) for t in targets} if targets is not None else None
+    frontier = list(settled)
+    depth = start_distance
+
+    while frontier and not _frontier_hits_targets(frontier, remaining_targets, stop_at_first_target):
+        depth += 1
+        next_frontier = []
+        for current_index in frontier:
+            for offset in offsets:
+                index = current_index + offset
+                if walls[index]:
+                    continue
+                if not seen[index]:
+                    seen[index] = 1
+                    settled[index] = depth
+                    previous[index] = [current_index]
+                    next_frontier.append(index)
+                elif settled.get(index) == depth:
+                    previous[index].append(current_index)
+        frontier = next_frontier
+    telemetry.count("bfs.visited", len(settled))
+    return graph.coord_result(settled, previous)
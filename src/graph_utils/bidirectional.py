@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import math
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from . import telemetry
+from .dijkstra import EdgeGetter
+
+
+@dataclass
+class BidirectionalResult[NodeType]:
+    """
+    Outcome of `bidirectional_dijkstra`. `forward` holds distances from the sources and `backward` distances to the
+    targets. Both are exact for every node on an optimal path, so those nodes are exactly the ones where the two add
+    up to `best`. Nodes off every optimal path may only appear on one side. The previous mappings are the tie-aware
+    predecessors of each search, so `backward_previous[node]` are the next steps towards a target.
+    """
+
+    best: float
+    forward: dict[NodeType, float]
+    backward: dict[NodeType, float]
+    forward_previous: defaultdict[NodeType, set[NodeType]]
+    backward_previous: defaultdict[NodeType, set[NodeType]]
+
+    def optimal_nodes(self) -> set[NodeType]:
+        if math.isinf(self.best):
+            return set()
+        backward = self.backward
+        return {node for node, dist in self.forward.items() if node in backward and dist + backward[node] == self.best}
+
+
+class _SearchSide[NodeType]:
+    """
+    One direction of the bidirectional search, a heap Dijkstra that is stepped one settled node at a time
+    """
+
+    def __init__(self, sources: Iterable[NodeType], edge_getter: EdgeGetter[NodeType]) -> None:
+        self.edge_getter = edge_getter
+        self.settled: dict[NodeType, float] = {}
+        self.tentative: dict[NodeType, float] = {node: 0 for node in sources}
+        self.sources = list(self.tentative)
+        self.previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
+        self._tie_breaker = itertools.count()
+        self.heap = [(0.0, next(self._tie_breaker), node) for node in self.tentative]
+
+    def top(self) -> float:
+        """
+        Smallest unsettled distance on this side, `math.inf` once exhausted. Stale entries are dropped on the way.
+        """
+        heap = self.heap
+        while heap and heap[0][2] in self.settled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else math.inf
+
+    def count_work(self) -> None:
+        """
+        Report heap pops and relaxations to telemetry, worked out from the tie breaker rather than counted as they go
+        """
+        pushes = next(self._tie_breaker)
+        telemetry.count("bidirectional.pops", pushes - len(self.heap))
+        telemetry.count("bidirectional.relaxations", pushes - len(self.sources))
+        telemetry.count("bidirectional.settled", len(self.settled))
+
+    def settled_previous(self) -> defaultdict[NodeType, set[NodeType]]:
+        return defaultdict(set, {node: prev for node, prev in self.previous.items() if node in self.settled})
+
+    def settle_next(self) -> list[NodeType]:
+        """
+        Settle the closest node and relax its edges, returning it along with every neighbour whose distance was touched
+        """
+        current_distance, _, current_node = heapq.heappop(self.heap)
+        self.settled[current_node] = current_distance
+        touched = [current_node]
+        for node, weight in self.edge_getter(current_node):
+            if node in self.settled:
+                continue
+            alt_distance = current_distance + weight
+            best_distance = self.tentative.get(node, math.inf)
+            if alt_distance < best_distance:
+                self.tentative[node] = alt_distance
+                self.previous[node] = {current_node}
+                heapq.heappush(self.heap, (alt_distance, next(self._tie_breaker), node))
+                touched.append(node)
+            elif alt_distance == best_distance:
+                self.previous[node].add(current_node)
+        return touched
+
+
+def bidirectional_dijkstra[
+    NodeType
+](
+    sources: Iterable[NodeType],
+    targets: Iterable[NodeType],
+    forward_edges: EdgeGetter[NodeType],
+    backward_edges: EdgeGetter[NodeType] | None = None,
+) -> BidirectionalResult[NodeType]:
+    """
+    Search forward from every source and backward from every target at once, always stepping whichever side has the
+    closer frontier. `backward_edges` must give the reversed edges of `forward_edges` (it defaults to `forward_edges`
+    for undirected graphs) and every weight must be positive.
+
+    The best meeting cost `mu` is the smallest forward plus backward tentative distance seen on any node. The search
+    stops once the two frontiers sum to strictly more than `mu`, which proves `mu` optimal and also means every node on
+    every optimal path has been settled by at least one side. The missing side of those nodes is then filled in from
+    the meeting points through the previous mappings, iteratively, so `BidirectionalResult.optimal_nodes` can read them
+    straight off the distance fields.
+    """
+    forward = _SearchSide(sources, forward_edges)
+    backward = _SearchSide(targets, backward_edges or forward_edges)
+    best = math.inf
+
+    while True:
+        forward_top = forward.top()
+        backward_top = backward.top()
+        if math.isinf(forward_top) or math.isinf(backward_top) or forward_top + backward_top > best:
+            break
+        side, other = (forward, backward) if forward_top <= backward_top else (backward, forward)
+        for node in side.settle_next():
+            if node in other.tentative:
+                best = min(best, side.tentative[node] + other.tentative[node])
+
+    # Sources are exact at 0 even if the search stopped before their side got round to settling them, and a path lying
+    # entirely on one side needs the far end's 0 to be found as a meeting point
+    for side in (forward, backward):
+        side.count_work()
+        for node in side.sources:
+            side.settled.setdefault(node, 0)
+    result = BidirectionalResult(
+        best, forward.settled, backward.settled, forward.settled_previous(), backward.settled_previous()
+    )
+    if not math.isinf(best):
+        _fill_optimal_distances(result, forward_edges)
+    return result
+
+
+def _fill_optimal_distances[
+    NodeType
+](result: BidirectionalResult[NodeType], forward_edges: EdgeGetter[NodeType]) -> None:
+    """
+    Every optimal path is a run of forward settled nodes joined to a run of backward settled nodes, either through a
+    node both sides know or through a single edge. Find those joins, then walk each side's previous mapping away
+    from them, giving every node on the way its missing distance as `best` minus the one it has.
+    """
+    best = result.best
+    forward = result.forward
+    backward = result.backward
+    forward_ends: list[NodeType] = []
+    backward_starts: list[NodeType] = []
+    for node, dist in forward.items():
+        if node in backward and dist + backward[node] == best:
+            forward_ends.append(node)
+            backward_starts.append(node)
+        for neighbour, weight in forward_edges(node):
+            if neighbour in backward and dist + weight + backward[neighbour] == best:
+                forward_ends.append(node)
+                backward_starts.append(neighbour)
+
+    for stack, known, missing, previous in (
+        (forward_ends, forward, backward, result.forward_previous),
+        (backward_starts, backward, forward, result.backward_previous),
+    ):
+        seen: set[NodeType] = set()
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            missing[node] = best - known[node]
+            stack.extend(previous.get(node, ()))
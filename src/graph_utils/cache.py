@@ -0,0 +1,179 @@
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from array import array
+from collections import defaultdict
+from collections.abc import Callable, Collection, Mapping
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Set to anything non-empty to make every cache that isn't told otherwise a pass-through
+BYPASS_ENVIRONMENT_VARIABLE = "AOC_NO_CACHE"
+
+# magic, distance typecode, node count, predecessor count, pickled node table length
+_HEADER = struct.Struct("<6s2sQQQ")
+_MAGIC = b"AOCDF1"
+_SUFFIX = ".dfield"
+
+
+def distance_field_key(input_path: Path, *solver_parameters: object) -> str:
+    """
+    Cache key for a distance field solved from `input_path`. Hashes the file contents rather than trusting its name or
+    mtime, plus the `repr` of anything else that changes the answer (which search, start node, grid size...).
+    """
+    digest = hashlib.sha256()
+    with open(input_path, "rb") as f:
+        digest.update(hashlib.file_digest(f, "sha256").digest())
+    digest.update(repr(solver_parameters).encode())
+    return digest.hexdigest()
+
+
+class DistanceFieldCache:
+    """
+    Directory of solved distance fields and their previous mappings, one binary file per key.
+
+    A file is a fixed header followed by the distances and a CSR encoding of the previous mapping (predecessor offsets
+    then predecessor indices) as raw 8 byte arrays, then a pickled table of the nodes the indices refer to. Loading
+    maps the file into memory and reads the arrays straight out of the mapping. Once the directory grows past
+    `max_bytes` the least recently used files are deleted. With `bypass` (or the `AOC_NO_CACHE` environment variable
+    when `bypass` is left as None) nothing is read or written. An entry that can't be read is deleted and treated as
+    missing.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        bypass: bool | None = None,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.bypass = bool(os.environ.get(BYPASS_ENVIRONMENT_VARIABLE)) if bypass is None else bypass
+
+    def get_or_solve[
+        NodeType
+    ](
+        self,
+        key: str,
+        solve: Callable[[], tuple[Mapping[NodeType, float], Mapping[NodeType, Collection[NodeType]]]],
+    ) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]:
+        """
+        Load the field stored under `key`, or run `solve` and store what it returns
+        """
+        cached: tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]] | None = self.load(key)
+        if cached is not None:
+            return cached
+        distances, previous = solve()
+        self.store(key, distances, previous)
+        return dict(distances), defaultdict(set, {node: set(prev) for node, prev in previous.items()})
+
+    def load[NodeType](self, key: str) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]] | None:
+        path = self._path(key)
+        if self.bypass or not path.exists():
+            return None
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                buffer = memoryview(mapped)
+                try:
+                    field: tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]] = _decode(buffer)
+                finally:
+                    buffer.release()
+        except (OSError, ValueError, TypeError, struct.error, pickle.UnpicklingError, EOFError, IndexError):
+            # Empty (mmap refuses those), truncated or not ours, so solve again and let the store replace it
+            path.unlink(missing_ok=True)
+            return None
+        # Loads count as use for eviction
+        os.utime(path)
+        return field
+
+    def store[
+        NodeType
+    ](self, key: str, distances: Mapping[NodeType, float], previous: Mapping[NodeType, Collection[NodeType]]) -> None:
+        if self.bypass:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crashed or concurrent run never leaves a half written file under the real name
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            for chunk in _encode(distances, previous):
+                f.write(chunk)
+        os.replace(f.name, self._path(key))
+        self._evict()
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def _evict(self) -> None:
+        """
+        Delete the least recently used files until the directory fits in `max_bytes`, always keeping the newest
+        """
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort(reverse=True)
+        total = 0
+        for position, (_, size, path) in enumerate(entries):
+            total += size
+            if total > self.max_bytes and position > 0:
+                path.unlink(missing_ok=True)
+
+
+def _encode[
+    NodeType
+](distances: Mapping[NodeType, float], previous: Mapping[NodeType, Collection[NodeType]]) -> list[bytes]:
+    nodes = list(distances)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    typecode = "q" if all(isinstance(dist, int) for dist in distances.values()) else "d"
+    offsets = array("q", [0])
+    predecessors = array("q")
+    for node in nodes:
+        predecessors.extend(node_index[prev] for prev in previous.get(node, ()))
+        offsets.append(len(predecessors))
+    node_table = pickle.dumps(nodes, protocol=5)
+    header = _HEADER.pack(_MAGIC, typecode.encode().ljust(2, b"\0"), len(nodes), len(predecessors), len(node_table))
+    # array("q") and array("d") share an item size so either one fits the typecode
+    return [
+        header,
+        array(typecode, distances.values()).tobytes(),
+        offsets.tobytes(),
+        predecessors.tobytes(),
+        node_table,
+    ]
+
+
+def _decode[NodeType](buffer: memoryview) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]:
+    magic, typecode, node_count, predecessor_count, node_table_length = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError("not a cached distance field")
+    position = _HEADER.size
+    views = []
+    try:
+        distances_view = buffer[position : (position := position + 8 * node_count)].cast(
+            typecode.rstrip(b"\0").decode()
+        )
+        views.append(distances_view)
+        offsets = buffer[position : (position := position + 8 * (node_count + 1))].cast("q")
+        views.append(offsets)
+        predecessors = buffer[position : (position := position + 8 * predecessor_count)].cast("q")
+        views.append(predecessors)
+        if position + node_table_length > len(buffer):
+            raise ValueError("truncated cached distance field")
+        nodes: list[NodeType] = pickle.loads(buffer[position : position + node_table_length])
+        distances: dict[NodeType, float] = dict(zip(nodes, distances_view.tolist()))
+        previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
+        for i, node in enumerate(nodes):
+            start, end = offsets[i], offsets[i + 1]
+            if start != end:
+                previous[node] = {nodes[prev] for prev in predecessors[start:end].tolist()}
+    finally:
+        # Every view has to go before the mapping can be closed, even when decoding failed part way
+        for view in views:
+            view.release()
+    return distances, previous
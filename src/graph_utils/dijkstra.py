@@ -1,8 +1,84 @@
+import heapq
+import itertools
+import math
 from collections import OrderedDict, defaultdict
-from queue import PriorityQueue
-from typing import Callable
+from collections.abc import Callable, Iterable, Mapping
+from typing import cast, overload
+
+from . import telemetry
+from .bfs import breadth_first
+from .grid import GridGraph
 
 type Coord = tuple[int, int]
+type EdgeGetter[NodeType] = Callable[[NodeType], Iterable[tuple[NodeType, float]]]
+type Expander[NodeType] = Callable[[float, NodeType], Iterable[tuple[NodeType, float]]]
+type Sources[NodeType] = Iterable[NodeType] | Mapping[NodeType, float]
+
+
+@overload
+def shortest_paths(
+    sources: Sources[Coord],
+    graph: GridGraph,
+    targets: Iterable[Coord] | None = None,
+    stop_at_first_target: bool = False,
+    max_weight: int | None = None,
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]: ...
+
+
+@overload
+def shortest_paths[
+    NodeType
+](
+    sources: Sources[NodeType],
+    graph: EdgeGetter[NodeType],
+    targets: Iterable[NodeType] | None = None,
+    stop_at_first_target: bool = False,
+    max_weight: int | None = None,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]: ...
+
+
+def shortest_paths[
+    NodeType
+](
+    sources: Sources[NodeType] | Sources[Coord],
+    graph: EdgeGetter[NodeType] | GridGraph,
+    targets: Iterable[NodeType] | Iterable[Coord] | None = None,
+    stop_at_first_target: bool = False,
+    max_weight: int | None = None,
+) -> (
+    tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]
+    | tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]
+):
+    """
+    Heap based Dijkstra. `graph` is either a `GridGraph` or an edge getter mapping a node to `(neighbour, weight)`
+    pairs. Nodes are discovered lazily so there is no need to build a distance dict of every node up front. `sources`
+    is either an iterable of nodes starting at distance 0 or a mapping of node to starting distance.
+
+    If `targets` are given the search stops as soon as all of them (or the first one with `stop_at_first_target`) are
+    settled. Returned distances only hold settled nodes and are in ascending order of distance. The previous mapping
+    holds every predecessor on a shortest path, so ties are kept. A `GridGraph` only has unit edges so it is handed to
+    `breadth_first` whenever the sources share a start distance.
+
+    Declaring `max_weight` promises every weight is an integer between 0 and `max_weight`, and swaps the heap for a
+    bucket queue (Dial's algorithm) with constant time queue operations. A `GridGraph` already has its own engines, so
+    for one `max_weight` is only checked against its unit edges.
+    """
+    if isinstance(graph, GridGraph):
+        if max_weight is not None and max_weight < 1:
+            raise ValueError(f"edge weight 1 is outside 0..{max_weight}")
+        grid_sources = _as_source_distances(cast(Sources[Coord], sources))
+        grid_targets = cast(Iterable[Coord] | None, targets)
+        # Every grid edge has weight 1, so unless the sources start at different distances a BFS gives the same answer
+        if len(set(grid_sources.values())) <= 1:
+            return breadth_first(grid_sources, graph, grid_targets, stop_at_first_target)
+        return _grid_heap_search(graph, grid_sources, grid_targets, stop_at_first_target)
+    return _search(
+        _as_source_distances(cast(Sources[NodeType], sources)),
+        _weighted_expander(graph),
+        cast(Iterable[NodeType] | None, targets),
+        stop_at_first_target,
+        max_weight,
+    )
 
 
 def dijkstra[
@@ -10,37 +86,239 @@ def dijkstra[
 ](
     distances: OrderedDict[NodeType, float],
     neighbour_getter: Callable[[float, NodeType, set[NodeType]], dict[NodeType, float]],
+    max_weight: int | None = None,
 ) -> tuple[OrderedDict[NodeType, float], dict[NodeType, set[NodeType]]]:
     """
-    Run Dijkstra's algorithm to create a distance mapping and previous mapping to reconstruct paths to end
+    Run Dijkstra's algorithm to create a distance mapping and previous mapping to reconstruct paths to end.
+
+    Compatibility wrapper around `shortest_paths` for the original pre-seeded call style. Nodes in `distances` with a
+    finite value are used as sources and `neighbour_getter` only ever sees nodes that are keys of `distances`. The
+    result keeps the old shape (every node, unreachable ones at `math.inf`, sorted by descending distance) but is
+    built from the settle order rather than re-sorted, and `distances` itself is left untouched. `max_weight` selects
+    the bucket queue as in `shortest_paths`.
     """
     unvisited_set = set(distances.keys())
-    unvisited: PriorityQueue[tuple[float, NodeType]] = PriorityQueue()
-    for node, dist in distances.items():
-        unvisited.put((dist, node))
+
+    def expand(current_distance: float, current_node: NodeType) -> Iterable[tuple[NodeType, float]]:
+        unvisited_set.discard(current_node)
+        return neighbour_getter(current_distance, current_node, unvisited_set).items()
+
+    sources = {node: dist for node, dist in distances.items() if not math.isinf(dist)}
+    settled, previous = _search(sources, expand, None, False, max_weight)
+    # Settle order is ascending, so reversing it and putting the unreachable nodes first gives the descending order
+    # `sort_distance_dict` would have produced.
+    solved: OrderedDict[NodeType, float] = OrderedDict((node, math.inf) for node in distances if node not in settled)
+    solved.update(reversed(settled.items()))
+    return solved, previous
+
+
+def _as_source_distances[NodeType](sources: Sources[NodeType]) -> dict[NodeType, float]:
+    if isinstance(sources, Mapping):
+        return dict(sources)
+    return {node: 0 for node in sources}
+
+
+def _weighted_expander[NodeType](edge_getter: EdgeGetter[NodeType]) -> Expander[NodeType]:
+    """
+    Adapt a `(neighbour, weight)` edge getter to the `(neighbour, candidate_distance)` form the search loops use
+    """
+    return lambda current_distance, node: ((n, current_distance + w) for n, w in edge_getter(node))
+
+
+def _search[
+    NodeType
+](
+    sources: dict[NodeType, float],
+    expand: Expander[NodeType],
+    targets: Iterable[NodeType] | None,
+    stop_at_first_target: bool,
+    max_weight: int | None,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]:
+    if max_weight is None:
+        return _heap_search(sources, expand, targets, stop_at_first_target)
+    return _bucket_search(sources, expand, targets, stop_at_first_target, max_weight)
+
+
+def _heap_search[
+    NodeType
+](
+    sources: dict[NodeType, float],
+    expand: Expander[NodeType],
+    targets: Iterable[NodeType] | None,
+    stop_at_first_target: bool,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]:
+    """
+    Shared heapq loop. `expand` gets the settled distance and node and returns `(neighbour, candidate_distance)` pairs.
+    Entries are never updated in place; a node popped after it is settled is a stale entry and skipped. The counter in
+    each entry breaks distance ties so nodes never need to be orderable.
+    """
+    settled: dict[NodeType, float] = {}
+    tentative = dict(sources)
     previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
-    while True:
-        if not unvisited_set:
-            return sort_distance_dict(distances), previous
-        _, current_node = unvisited.get()
-        # Hack to deal with this priority queue not having an update method. If it's priority has been updated with
-        # alt_distance it will show up before the old entry in the queue and get removed from unvisited set, so we can
-        # skip safely skip and not worry about updating
-        if current_node not in unvisited_set:
+    tie_breaker = itertools.count()
+    heap = [(dist, next(tie_breaker), node) for node, dist in tentative.items()]
+    heapq.heapify(heap)
+    remaining_targets = set(targets) if targets is not None else None
+    stopped_early = False
+
+    while heap:
+        current_distance, _, current_node = heapq.heappop(heap)
+        if current_node in settled:
             continue
-        unvisited_set.remove(current_node)
-        current_distance = distances[current_node]
-        neighbours: dict[NodeType, float] = neighbour_getter(current_distance, current_node, unvisited_set)
-        for node, alt_distance in neighbours.items():
-            current_distance = distances[node]
-            if alt_distance <= current_distance:
-                distances[node] = min(distances[node], alt_distance)
-                if alt_distance < current_distance:
+        settled[current_node] = current_distance
+        if remaining_targets is not None and current_node in remaining_targets:
+            remaining_targets.remove(current_node)
+            if stop_at_first_target or not remaining_targets:
+                stopped_early = bool(heap)
+                break
+        for node, alt_distance in expand(current_distance, current_node):
+            if node in settled:
+                continue
+            best_distance = tentative.get(node, math.inf)
+            if alt_distance < best_distance:
+                tentative[node] = alt_distance
+                previous[node] = {current_node}
+                heapq.heappush(heap, (alt_distance, next(tie_breaker), node))
+            elif alt_distance == best_distance:
+                previous[node].add(current_node)
+
+    if stopped_early:
+        # Frontier nodes only have tentative predecessors, drop them so everything returned is final
+        for node in [node for node in previous if node not in settled]:
+            del previous[node]
+    # Every push drew a tie breaker, so the loop never has to count anything itself
+    pushes = next(tie_breaker)
+    telemetry.count("dijkstra.pops", pushes - len(heap))
+    telemetry.count("dijkstra.relaxations", pushes - len(sources))
+    telemetry.count("dijkstra.settled", len(settled))
+    return settled, previous
+
+
+def _bucket_search[
+    NodeType
+](
+    sources: dict[NodeType, float],
+    expand: Expander[NodeType],
+    targets: Iterable[NodeType] | None,
+    stop_at_first_target: bool,
+    max_weight: int,
+) -> tuple[dict[NodeType, float], defaultdict[NodeType, set[NodeType]]]:
+    """
+    `_heap_search` with Dial's bucket queue. Every unsettled tentative distance lies within `max_weight` of the
+    distance being settled, so `max_weight + 1` buckets indexed by distance modulo their count can be swept in order
+    like a clock. Pushing is an append and a stale entry is skipped just like in the heap. Sources further ahead than
+    the window are held back until the sweep gets close enough to drop them into their bucket.
+    """
+    if max_weight < 0:
+        raise ValueError("max_weight can't be negative")
+    bucket_count = max_weight + 1
+    buckets: list[list[NodeType]] = [[] for _ in range(bucket_count)]
+    settled: dict[NodeType, float] = {}
+    tentative = dict(sources)
+    previous: defaultdict[NodeType, set[NodeType]] = defaultdict(set)
+    pending_sources = sorted(sources.items(), key=lambda item: item[1], reverse=True)
+    remaining_targets = set(targets) if targets is not None else None
+    stopped_early = False
+    # Kept as running totals rather than one queue length so they double as the pop and push counts for telemetry
+    pushed = popped = 0
+    current_distance = pending_sources[-1][1] if pending_sources else 0
+
+    while pushed != popped or pending_sources:
+        if pushed == popped and pending_sources[-1][1] > current_distance:
+            # Nothing in the window, skip straight to the next source rather than sweeping empty buckets
+            current_distance = pending_sources[-1][1]
+        while pending_sources and pending_sources[-1][1] <= current_distance + max_weight:
+            node, dist = pending_sources.pop()
+            buckets[int(dist) % bucket_count].append(node)
+            pushed += 1
+        bucket = buckets[int(current_distance) % bucket_count]
+        while bucket:
+            current_node = bucket.pop()
+            popped += 1
+            if current_node in settled:
+                continue
+            # Same value as the sweep position, but keeps whatever number type the caller's weights produce
+            node_distance = settled[current_node] = tentative[current_node]
+            if remaining_targets is not None and current_node in remaining_targets:
+                remaining_targets.remove(current_node)
+                if stop_at_first_target or not remaining_targets:
+                    stopped_early = True
+                    break
+            for node, alt_distance in expand(node_distance, current_node):
+                if node in settled:
+                    continue
+                if not 0 <= alt_distance - node_distance <= max_weight:
+                    raise ValueError(f"edge weight {alt_distance - node_distance} is outside 0..{max_weight}")
+                best_distance = tentative.get(node, math.inf)
+                if alt_distance < best_distance:
+                    tentative[node] = alt_distance
                     previous[node] = {current_node}
-                    unvisited.put((alt_distance, node))
-                else:
+                    buckets[int(alt_distance) % bucket_count].append(node)
+                    pushed += 1
+                elif alt_distance == best_distance:
                     previous[node].add(current_node)
-    return sort_distance_dict(distances), previous
+        if stopped_early:
+            for node in [node for node in previous if node not in settled]:
+                del previous[node]
+            break
+        current_distance += 1
+    telemetry.count("dijkstra.pops", popped)
+    # Every push other than a source's was a relaxation
+    telemetry.count("dijkstra.relaxations", pushed - (len(sources) - len(pending_sources)))
+    telemetry.count("dijkstra.settled", len(settled))
+    return settled, previous
+
+
+def _grid_heap_search(
+    graph: GridGraph,
+    sources: dict[Coord, float],
+    targets: Iterable[Coord] | None,
+    stop_at_first_target: bool,
+) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]:
+    """
+    `_heap_search` specialised to a `GridGraph`. Works on flat indices with list backed distances and the wall bitmap
+    so relaxing an edge is an add and two byte lookups. Coordinates are only rebuilt once per settled node at the end.
+    """
+    walls = graph.walls
+    offsets = graph.offsets
+    tentative = [math.inf] * graph.size
+    is_settled = bytearray(graph.size)
+    settled: dict[int, float] = {}
+    previous: dict[int, list[int]] = {}
+    heap: list[tuple[float, int]] = []
+    for coord, dist in sources.items():
+        index = graph.open_index(coord)
+        tentative[index] = min(tentative[index], dist)
+        heap.append((dist, index))
+    heapq.heapify(heap)
+    remaining_targets = {graph.index(t) for t in targets} if targets is not None else None
+
+    while heap:
+        current_distance, current_index = heapq.heappop(heap)
+        if is_settled[current_index]:
+            continue
+        is_settled[current_index] = 1
+        settled[current_index] = current_distance
+        if remaining_targets is not None and current_index in remaining_targets:
+            remaining_targets.remove(current_index)
+            if stop_at_first_target or not remaining_targets:
+                break
+        alt_distance = current_distance + 1
+        for offset in offsets:
+            index = current_index + offset
+            if walls[index] or is_settled[index]:
+                continue
+            best_distance = tentative[index]
+            if alt_distance < best_distance:
+                tentative[index] = alt_distance
+                previous[index] = [current_index]
+                heapq.heappush(heap, (alt_distance, index))
+            elif alt_distance == best_distance:
+                # A source reached at its own start distance has no entry yet
+                previous.setdefault(index, []).append(current_index)
+
+    telemetry.count("dijkstra.settled", len(settled))
+    return graph.coord_result(settled, previous)
 
 
 def sort_distance_dict[NodeType](distances: OrderedDict[NodeType, float]) -> OrderedDict[NodeType, float]:
@@ -0,0 +1,95 @@
+from collections import defaultdict
+from collections.abc import Iterable
+
+type Coord = tuple[int, int]
+
+
+class GridGraph:
+    """
+    4-neighbour grid with unit edge weights stored as flat integer indices. The grid is padded with a one cell wall
+    border so a neighbour is just `index + offset` and never needs a bounds check, and walls live in a `bytearray`
+    bitmap (1 for wall, 0 for open). Coordinates are `(row, col)` like everywhere else in the repo.
+    """
+
+    def __init__(self, max_row: int, max_col: int, walls: Iterable[Coord] = ()) -> None:
+        if max_row < 0 or max_col < 0:
+            raise ValueError("grid needs at least one row and one column")
+        self.max_row = max_row
+        self.max_col = max_col
+        self.width = max_col + 3
+        self.size = self.width * (max_row + 3)
+        # Same order as `get_neighbours`: down, up, right, left
+        self.offsets = (self.width, -self.width, 1, -1)
+        self.walls = bytearray(self.size)
+        self.walls[: self.width] = b"\x01" * self.width
+        self.walls[-self.width :] = b"\x01" * self.width
+        self.walls[self.width :: self.width] = b"\x01" * (max_row + 2)
+        self.walls[self.width - 1 :: self.width] = b"\x01" * (max_row + 3)
+        for coord in walls:
+            self.walls[self.index(coord)] = 1
+
+    @classmethod
+    def from_lines(cls, lines: list[str], wall: str = "#") -> "GridGraph":
+        """
+        Build a grid from the lines of a puzzle map where `wall` marks a blocked cell
+        """
+        return cls(
+            len(lines) - 1,
+            len(lines[0]) - 1,
+            ((i, j) for i, line in enumerate(lines) for j, char in enumerate(line) if char == wall),
+        )
+
+    def index(self, coord: Coord) -> int:
+        row, col = coord
+        if not (0 <= row <= self.max_row and 0 <= col <= self.max_col):
+            raise ValueError(f"{coord} is outside of the {self.max_row + 1}x{self.max_col + 1} grid")
+        return (row + 1) * self.width + col + 1
+
+    def open_index(self, coord: Coord) -> int:
+        """
+        Flat index of `coord` for use as a search source, which has to be an open cell
+        """
+        index = self.index(coord)
+        if self.walls[index]:
+            raise ValueError(f"{coord} is a wall")
+        return index
+
+    def coord(self, index: int) -> Coord:
+        row, col = divmod(index, self.width)
+        return row - 1, col - 1
+
+    def is_open(self, coord: Coord) -> bool:
+        return not self.walls[self.index(coord)]
+
+    def set_wall(self, coord: Coord, is_wall: bool = True) -> None:
+        self.walls[self.index(coord)] = is_wall
+
+    def neighbours(self, index: int) -> list[int]:
+        """
+        Open cells next to the cell at flat `index`
+        """
+        walls = self.walls
+        return [n for offset in self.offsets if not walls[n := index + offset]]
+
+    def open_indices(self) -> list[int]:
+        return [i for i, is_wall in enumerate(self.walls) if not is_wall]
+
+    def copy(self) -> "GridGraph":
+        copied = GridGraph(self.max_row, self.max_col)
+        copied.walls[:] = self.walls
+        return copied
+
+    def coord_result(
+        self, settled: dict[int, float], previous: dict[int, list[int]]
+    ) -> tuple[dict[Coord, float], defaultdict[Coord, set[Coord]]]:
+        """
+        Turn flat index search results back into the coordinate keyed distances and previous mapping the rest of
+        `graph_utils` returns, dropping predecessors of any cell that was never settled
+        """
+        coord = self.coord
+        distances = {coord(index): dist for index, dist in settled.items()}
+        coord_previous: defaultdict[Coord, set[Coord]] = defaultdict(set)
+        for index, prev in previous.items():
+            if index in settled:
+                coord_previous[coord(index)] = {coord(p) for p in prev}
+        return distances, coord_previous
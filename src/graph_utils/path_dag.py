@@ -0,0 +1,77 @@
+from collections.abc import Collection, Hashable, Iterable, Mapping
+from typing import Any, Protocol
+
+type Previous[NodeType] = Mapping[NodeType, Collection[NodeType]]
+
+
+class Orderable(Hashable, Protocol):
+    def __lt__(self, other: Any, /) -> bool: ...
+
+
+def predecessor_order[NodeType](previous: Previous[NodeType], targets: Iterable[NodeType]) -> list[NodeType]:
+    """
+    Every node with a path to one of `targets` through `previous`, each listed after all of its predecessors. This is
+    an iterative depth first post-order, so it handles paths of any length in time linear in the size of the DAG. A node
+    met again while its own predecessors are still being walked means `previous` has a cycle, which is a ValueError.
+    """
+    order: list[NodeType] = []
+    finished: set[NodeType] = set()
+    # Expanded but unfinished nodes are exactly the ones on the path currently being walked
+    expanded: set[NodeType] = set()
+    for target in targets:
+        stack = [target]
+        while stack:
+            node = stack.pop()
+            if node in finished:
+                continue
+            if node in expanded:
+                finished.add(node)
+                order.append(node)
+                continue
+            expanded.add(node)
+            stack.append(node)
+            for prev in previous.get(node, ()):
+                if prev in finished:
+                    continue
+                if prev in expanded:
+                    raise ValueError(f"previous mapping has a cycle through {prev}")
+                stack.append(prev)
+    return order
+
+
+def optimal_path_nodes[NodeType](previous: Previous[NodeType], targets: Iterable[NodeType]) -> set[NodeType]:
+    """
+    Set of nodes on any shortest path to `targets`, given a tie-aware previous mapping from one of the searches
+    """
+    return set(predecessor_order(previous, targets))
+
+
+def count_optimal_paths[NodeType](previous: Previous[NodeType], targets: Iterable[NodeType]) -> int:
+    """
+    Number of distinct shortest paths from any source to any of `targets`. A node with no predecessors is a source and
+    starts one path, every other node has the sum of its predecessors' counts. Python ints so it never overflows.
+    """
+    target_list = list(targets)
+    path_counts: dict[NodeType, int] = {}
+    for node in predecessor_order(previous, target_list):
+        prevs = previous.get(node, ())
+        path_counts[node] = sum(path_counts[prev] for prev in prevs) if prevs else 1
+    return sum(path_counts[target] for target in set(target_list))
+
+
+def canonical_path[NodeType: Orderable](previous: Previous[NodeType], target: NodeType) -> list[NodeType]:
+    """
+    One shortest path from a source to `target`, always stepping back to the smallest predecessor so the same previous
+    mapping always gives the same path
+    """
+    path = [target]
+    seen = {target}
+    node = target
+    while prevs := previous.get(node):
+        node = min(prevs)
+        if node in seen:
+            raise ValueError(f"previous mapping has a cycle through {node}")
+        seen.add(node)
+        path.append(node)
+    path.reverse()
+    return path
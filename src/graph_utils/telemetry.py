@@ -0,0 +1,85 @@
+import contextlib
+import os
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+
+PROGRESS_ENVIRONMENT_VARIABLE = "AOC_PROGRESS"
+STATS_ENVIRONMENT_VARIABLE = "AOC_STATS"
+
+# Read once at import and then only through these globals, so a disabled check is one lookup. They live in the
+# environment too so worker processes started after `enable` inherit them.
+_progress = bool(os.environ.get(PROGRESS_ENVIRONMENT_VARIABLE))
+_stats = bool(os.environ.get(STATS_ENVIRONMENT_VARIABLE))
+_counters: Counter[str] = Counter()
+_timers: defaultdict[str, float] = defaultdict(float)
+_NO_TIMER = contextlib.nullcontext()
+
+
+def enable(progress: bool = False, stats: bool = False) -> None:
+    """
+    Turn on progress bars and/or counters and timers for this process and any it starts from here on
+    """
+    global _progress, _stats
+    _progress = progress
+    _stats = stats
+    for variable, enabled in ((PROGRESS_ENVIRONMENT_VARIABLE, progress), (STATS_ENVIRONMENT_VARIABLE, stats)):
+        if enabled:
+            os.environ[variable] = "1"
+        else:
+            os.environ.pop(variable, None)
+
+
+def stats_enabled() -> bool:
+    return _stats
+
+
+def count(name: str, amount: int = 1) -> None:
+    """
+    Add `amount` to the counter `name`. Hot loops should tally into a local and count once when they finish, or derive
+    the figure from state they keep anyway, rather than calling this per iteration.
+    """
+    if _stats:
+        _counters[name] += amount
+
+
+def timer(name: str) -> contextlib.AbstractContextManager[None]:
+    """
+    Context manager adding the wall time spent inside it to the timer `name`. Entering it more than once accumulates.
+    """
+    if not _stats:
+        return _NO_TIMER
+    return _timed(name)
+
+
+def progress[T](iterable: Iterable[T], total: int | None = None, description: str | None = None) -> Iterable[T]:
+    """
+    Show a tqdm progress bar over `iterable` when progress is enabled, otherwise hand back `iterable` itself so the loop
+    runs exactly as if it had never been wrapped
+    """
+    if not _progress:
+        return iterable
+    # Only imported when someone is watching
+    from tqdm import tqdm
+
+    return tqdm(iterable, total=total, desc=description)
+
+
+def format_stats() -> str:
+    lines = [f"{name:<40}{value:>16}" for name, value in sorted(_counters.items())]
+    lines.extend(f"{name:<40}{seconds:>15.3f}s" for name, seconds in sorted(_timers.items()))
+    return "\n".join(lines) if lines else "no stats recorded"
+
+
+def reset() -> None:
+    _counters.clear()
+    _timers.clear()
+
+
+@contextlib.contextmanager
+def _timed(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _timers[name] += time.perf_counter() - start
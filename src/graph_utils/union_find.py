@@ -0,0 +1,81 @@
+from collections import Counter
+from collections.abc import Sequence
+
+from .grid import GridGraph
+
+type Coord = tuple[int, int]
+
+
+class DisjointSet:
+    """
+    Union-find over the integers `0..size - 1` with union by size and path halving, so a run of operations is near
+    linear. Pairs naturally with the flat indices of a `GridGraph`.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+        self.set_size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while (item_parent := parent[item]) != item:
+            parent[item] = item = parent[item_parent]
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """
+        Merge the sets holding `a` and `b`, returns False if they were already the same set
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return False
+        if self.set_size[root_a] < self.set_size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.set_size[root_a] += self.set_size[root_b]
+        return True
+
+    def connected(self, a: int, b: int) -> bool:
+        return self.find(a) == self.find(b)
+
+
+def first_blocking_index(graph: GridGraph, walls: Sequence[Coord], start: Coord, end: Coord) -> int | None:
+    """
+    Index of the first entry of `walls` that, once it and every wall before it are added to `graph`, leaves no path
+    from `start` to `end`. None if the walls never cut them off, either because they are still connected with every
+    wall in place or because they were never connected to begin with.
+
+    Answered offline in one pass rather than with a search per probe: place every wall, join up the open cells, then
+    take walls back out from the end of the list, joining each reopened cell to its open neighbours, until `start` and
+    `end` share a set. The wall just removed is the one that blocked them. `graph` itself is not modified and repeated
+    walls only reopen a cell when the last copy is removed.
+    """
+    blocked = graph.copy()
+    wall_counts = Counter(blocked.index(wall) for wall in walls)
+    for index in wall_counts:
+        blocked.walls[index] = 1
+    start_index = blocked.index(start)
+    end_index = blocked.index(end)
+    cells = DisjointSet(blocked.size)
+    walls_bitmap = blocked.walls
+    for index in blocked.open_indices():
+        for neighbour in blocked.neighbours(index):
+            cells.union(index, neighbour)
+
+    def is_connected() -> bool:
+        return not (walls_bitmap[start_index] or walls_bitmap[end_index]) and cells.connected(start_index, end_index)
+
+    if is_connected():
+        return None
+    for position in range(len(walls) - 1, -1, -1):
+        index = blocked.index(walls[position])
+        wall_counts[index] -= 1
+        if wall_counts[index] or graph.walls[index]:
+            continue
+        walls_bitmap[index] = 0
+        for neighbour in blocked.neighbours(index):
+            cells.union(index, neighbour)
+        if is_connected():
+            return position
+    return None
@@ -0,0 +1,56 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aoc2024.day01 import day01
+
+
+def _in_memory_totals(source: bytes) -> tuple[int, int]:
+    return (
+        day01.RowWiseProblem(source, day01.distance_row_operator, day01.sum_aggregator).solve(),
+        day01.ColumnWiseProblem(source, day01.occurrence_counting_column_operator, day01.sum_aggregator).solve(),
+    )
+
+
+def _random_input(rng: random.Random, rows: int, largest: int) -> bytes:
+    return b"".join(b"%d   %d\n" % (rng.randint(0, largest), rng.randint(0, largest)) for _ in range(rows))
+
+
+class ExternalSortTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        patcher = mock.patch.object(day01, "CACHE_DIRECTORY", self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_matches_in_memory(self) -> None:
+        rng = random.Random(1)
+        for rows in (0, 1, 7, 300, 1500):
+            for largest in (5, 1000, 10**9):
+                for budget in (500, 2_000, 50_000, 1 << 20):
+                    with self.subTest(rows=rows, largest=largest, budget=budget):
+                        source = _random_input(rng, rows, largest)
+                        self.assertEqual(day01.external_sort_totals(source, budget), _in_memory_totals(source))
+
+    def test_merges_in_passes_under_the_open_file_limit(self) -> None:
+        rng = random.Random(2)
+        source = _random_input(rng, 4000, 10**6)
+        with mock.patch("resource.getrlimit", return_value=(day01._RESERVED_DESCRIPTORS + 6, 1024)):
+            self.assertEqual(day01._merge_fan_in(1 << 30), 3)
+            with mock.patch.object(day01, "_merge_runs", wraps=day01._merge_runs) as merge_runs:
+                self.assertEqual(day01.external_sort_totals(source, 2_000), _in_memory_totals(source))
+        self.assertTrue(merge_runs.called)
+        self.assertTrue(all(len(call.args[0]) <= 3 for call in merge_runs.call_args_list))
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_different_column_lengths(self) -> None:
+        with self.assertRaises(ValueError):
+            day01.external_sort_totals(b"1 2\n3\n", 1 << 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
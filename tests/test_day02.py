@@ -0,0 +1,69 @@
+import itertools
+import random
+import unittest
+from array import array
+from collections.abc import Sequence
+
+from aoc2024.day02.day02 import MAX_LEVEL_STEP, ReportSet, is_safe, is_safe_span
+
+
+def _brute_force_is_safe(levels: Sequence[int], max_removals: int) -> bool:
+    for removals in range(min(max_removals, len(levels)) + 1):
+        for removed in itertools.combinations(range(len(levels)), removals):
+            kept = [level for i, level in enumerate(levels) if i not in removed]
+            steps = [after - before for before, after in itertools.pairwise(kept)]
+            if all(1 <= step <= MAX_LEVEL_STEP for step in steps) or all(
+                -MAX_LEVEL_STEP <= step <= -1 for step in steps
+            ):
+                return True
+    return False
+
+
+def _random_reports(rng: random.Random, count: int) -> list[list[int]]:
+    reports = []
+    for _ in range(count):
+        # Mostly steady runs with a few bad steps, so plenty of reports sit near the edge of each removal count
+        level = rng.randint(0, 20)
+        direction = rng.choice((1, -1))
+        report = []
+        for _ in range(rng.randint(0, 9)):
+            report.append(level)
+            level += direction * rng.randint(1, 3) if rng.random() < 0.7 else rng.randint(-5, 5)
+        reports.append(report)
+    return reports
+
+
+class SafetyTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.reports = _random_reports(random.Random(2), 3000)
+
+    def test_is_safe_matches_brute_force(self) -> None:
+        for max_removals in range(4):
+            for report in self.reports:
+                with self.subTest(report=report, max_removals=max_removals):
+                    self.assertEqual(is_safe(report, max_removals), _brute_force_is_safe(report, max_removals))
+
+    def test_is_safe_span_only_looks_at_its_span(self) -> None:
+        for max_removals in range(3):
+            for report in self.reports[:500]:
+                padded = [100, -100, *report, 100, -100]
+                with self.subTest(report=report, max_removals=max_removals):
+                    self.assertEqual(
+                        is_safe_span(padded, 2, len(padded) - 2, max_removals), is_safe(report, max_removals)
+                    )
+
+    def test_report_set_matches_brute_force(self) -> None:
+        levels = array("q", itertools.chain.from_iterable(self.reports))
+        offsets = array("q", [0, *itertools.accumulate(map(len, self.reports))])
+        report_set = ReportSet(levels, offsets)
+        # Asked about in a shuffled order, so cached verdicts for other removal counts get reused along the way
+        for max_removals in (2, 0, 1):
+            with self.subTest(max_removals=max_removals):
+                expected = [_brute_force_is_safe(report, max_removals) for report in self.reports]
+                self.assertEqual([view.is_okay for view in report_set.reports(max_removals)], expected)
+                self.assertEqual(report_set.count_safe(max_removals), sum(expected))
+        self.assertEqual([view.is_okay for view in report_set], [view.is_okay for view in report_set.reports(0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import re
+import unittest
+
+from aoc2024.day03.day03 import (
+    Day3Runner,
+    extract_numbers,
+    extract_numbers_in_dos,
+    scan_instructions,
+)
+
+PIECES = [
+    b"mul(",
+    b"mu",
+    b"l",
+    b"(",
+    b")",
+    b",",
+    b"1",
+    b"23",
+    b"456",
+    b"7890",
+    b"do()",
+    b"don't()",
+    b"do",
+    b"n't(",
+    b"\n",
+]
+PIECES += [b"x", b"\r\n", b"mul(2,4)", b"mul(123,456)", b"mul(1234,5)", b"add(6,7)", b"add(987,654)"]
+
+
+def _random_memory(rng: random.Random, pieces: int) -> bytes:
+    return b"".join(rng.choice(PIECES) for _ in range(pieces))
+
+
+def _reference_products(memory: bytes, function_name: str) -> tuple[int, int]:
+    """
+    Both parts worked out over the whole input at once, without chunks
+    """
+    whole = memory.replace(b"\r", b"").replace(b"\n", b"")
+    call = re.escape(function_name.encode())
+    part1 = sum(int(left) * int(right) for left, right in re.findall(rb"%s\((\d{1,3}),(\d{1,3})\)" % call, whole))
+    part2 = 0
+    enabled = True
+    for match in re.finditer(rb"%s\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)" % call, whole):
+        if match[0] == b"do()":
+            enabled = True
+        elif match[0] == b"don't()":
+            enabled = False
+        elif enabled:
+            part2 += int(match[1]) * int(match[2])
+    return part1, part2
+
+
+def _chunked(memory: bytes, chunk_size: int) -> list[bytes]:
+    return [memory[position : position + chunk_size] for position in range(0, len(memory), chunk_size)]
+
+
+class ScanInstructionsTest(unittest.TestCase):
+    def test_matches_a_whole_input_scan_at_any_chunk_size(self) -> None:
+        rng = random.Random(3)
+        for function_name in ("mul", "add"):
+            runner = Day3Runner(extract_numbers, lambda x, y: x * y, sum, function_name)
+            for _ in range(60):
+                memory = _random_memory(rng, rng.randint(0, 300))
+                expected = _reference_products(memory, function_name)
+                for chunk_size in (1, 2, 3, 5, 7, 64, len(memory) + 1):
+                    with self.subTest(function_name=function_name, memory=memory, chunk_size=chunk_size):
+                        chunks = _chunked(memory, chunk_size)
+                        part1 = sum(
+                            x * y
+                            for x, y in extract_numbers(
+                                scan_instructions(runner.pattern, chunks, runner.longest_instruction)
+                            )
+                        )
+                        part2 = sum(
+                            x * y
+                            for x, y in extract_numbers_in_dos(
+                                scan_instructions(runner.pattern, chunks, runner.longest_instruction)
+                            )
+                        )
+                        self.assertEqual((part1, part2), expected)
+
+    def test_run_reads_the_whole_input(self) -> None:
+        memory = b"xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))"
+        self.assertEqual(Day3Runner(extract_numbers, lambda x, y: x * y, sum).run(memory), 161)
+        self.assertEqual(Day3Runner(extract_numbers_in_dos, lambda x, y: x * y, sum).run(memory), 48)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+from collections.abc import Iterator
+
+from graph_utils.dijkstra import EdgeGetter, shortest_paths
+from graph_utils.grid import Coord, GridGraph
+
+
+def _edges(graph: GridGraph) -> EdgeGetter[Coord]:
+    def edges(coord: Coord) -> Iterator[tuple[Coord, float]]:
+        row, col = coord
+        for neighbour in ((row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)):
+            if 0 <= neighbour[0] <= graph.max_row and 0 <= neighbour[1] <= graph.max_col and graph.is_open(neighbour):
+                yield neighbour, 1
+
+    return edges
+
+
+class GridShortestPathsTest(unittest.TestCase):
+    def test_reached_source_at_its_start_distance(self) -> None:
+        distances, previous = shortest_paths({(0, 0): 0, (0, 1): 1}, GridGraph(0, 1))
+        self.assertEqual(distances, {(0, 0): 0, (0, 1): 1})
+        self.assertEqual(previous, {(0, 1): {(0, 0)}})
+
+    def test_unequal_source_distances_match_the_generic_engine(self) -> None:
+        rng = random.Random(4)
+        for _ in range(300):
+            max_row = rng.randint(0, 6)
+            max_col = rng.randint(0, 6)
+            cells = [(row, col) for row in range(max_row + 1) for col in range(max_col + 1)]
+            walls = [cell for cell in cells if rng.random() < 0.25]
+            graph = GridGraph(max_row, max_col, walls)
+            open_cells = [cell for cell in cells if graph.is_open(cell)]
+            if not open_cells:
+                continue
+            sources = {
+                cell: rng.randint(0, 4) for cell in rng.sample(open_cells, rng.randint(1, min(4, len(open_cells))))
+            }
+            targets = rng.sample(open_cells, rng.randint(1, len(open_cells)))
+            with self.subTest(graph=(max_row, max_col, walls), sources=sources, targets=targets):
+                full = shortest_paths(sources, _edges(graph))
+                self.assertEqual(shortest_paths(sources, graph), full)
+                # Stopping early can settle cells tied on distance in either order, but whatever is settled is final
+                for stop_at_first_target in (False, True):
+                    distances, previous = shortest_paths(sources, graph, targets, stop_at_first_target)
+                    self.assertEqual(distances, {cell: full[0][cell] for cell in distances})
+                    self.assertEqual(previous, {cell: full[1][cell] for cell in distances if cell in full[1]})
+
+    def test_max_weight_has_to_admit_unit_edges(self) -> None:
+        graph = GridGraph(1, 1)
+        self.assertEqual(shortest_paths([(0, 0)], graph, max_weight=1), shortest_paths([(0, 0)], graph))
+        with self.assertRaises(ValueError):
+            shortest_paths([(0, 0)], graph, max_weight=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
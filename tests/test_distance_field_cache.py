@@ -0,0 +1,39 @@
+import tempfile
+import unittest
+from collections import defaultdict
+from pathlib import Path
+
+from graph_utils.cache import DistanceFieldCache
+
+DISTANCES = {(0, 0): 0, (0, 1): 1, (1, 1): 2}
+PREVIOUS = {(0, 1): {(0, 0)}, (1, 1): {(0, 1)}}
+
+
+class DistanceFieldCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = DistanceFieldCache(Path(self.directory.name), bypass=False)
+        self.cache.store("key", DISTANCES, PREVIOUS)
+        self.entry = next(Path(self.directory.name).glob("key*"))
+
+    def test_round_trip(self) -> None:
+        self.assertEqual(self.cache.load("key"), (DISTANCES, defaultdict(set, PREVIOUS)))
+
+    def test_unreadable_entries_are_misses(self) -> None:
+        whole = self.entry.read_bytes()
+        for contents in (b"", whole[:20], whole[:-3], b"x" * len(whole)):
+            with self.subTest(length=len(contents)):
+                self.entry.write_bytes(contents)
+                self.assertIsNone(self.cache.load("key"))
+                self.assertFalse(self.entry.exists())
+
+    def test_solves_again_after_a_bad_entry(self) -> None:
+        self.entry.write_bytes(b"")
+        solved = self.cache.get_or_solve("key", lambda: (DISTANCES, PREVIOUS))
+        self.assertEqual(solved[0], DISTANCES)
+        self.assertEqual(self.cache.load("key"), (DISTANCES, defaultdict(set, PREVIOUS)))
+
+
+if __name__ == "__main__":
+    unittest.main()
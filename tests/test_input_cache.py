@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from aoc2024 import input_cache
+from aoc2024.input_source import InputSource, read_text
+
+
+class CachedParserTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        patch = mock.patch.object(input_cache, "PARSED_CACHE_DIRECTORY", self.root / "parsed")
+        patch.start()
+        self.addCleanup(patch.stop)
+        environment = mock.patch.dict(os.environ)
+        environment.start()
+        self.addCleanup(environment.stop)
+        os.environ.pop(input_cache.BYPASS_ENVIRONMENT_VARIABLE, None)
+        self.input = self.root / "input.txt"
+        self.input.write_text("1 2 3\n")
+        self.calls = 0
+
+        @input_cache.cached_parser
+        def parse(source: InputSource) -> list[int]:
+            self.calls += 1
+            return list(map(int, read_text(source).split()))
+
+        self.parse = parse
+
+    def entry(self) -> Path:
+        return next((self.root / "parsed").glob("*.pickle"))
+
+    def test_second_parse_is_cached(self) -> None:
+        self.assertEqual(self.parse(self.input), [1, 2, 3])
+        self.assertEqual(self.parse(self.input), [1, 2, 3])
+        self.assertEqual(self.calls, 1)
+
+    def test_unreadable_entries_are_parsed_again(self) -> None:
+        self.parse(self.input)
+        whole = self.entry().read_bytes()
+        for contents in (b"", whole[:10], whole[:-1], b"x" * len(whole), whole[:-1] + b"\xff"):
+            with self.subTest(contents=contents):
+                self.entry().write_bytes(contents)
+                calls = self.calls
+                self.assertEqual(self.parse(self.input), [1, 2, 3])
+                self.assertEqual(self.calls, calls + 1)
+                # Replaced with a good entry
+                self.assertEqual(self.parse(self.input), [1, 2, 3])
+                self.assertEqual(self.calls, calls + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()